@@ -3,17 +3,74 @@ Abstract syntax tree renderer for mistletoe.
 """
 
 import json
+from json.encoder import encode_basestring_ascii as _encode_string
+from mistletoe import block_token
 from mistletoe.base_renderer import BaseRenderer
 
 
 class AstRenderer(BaseRenderer):
+    """
+    Renders the abstract syntax tree of a token as JSON, in the format
+    of `get_ast`.
+
+    The JSON is written by an iterative serializer, so that deeply nested
+    trees don't hit the recursion limit, and `render_to` writes it out in
+    chunks, without building the dictionaries of `get_ast` or the whole string.
+
+    Attributes:
+        flush_threshold (int): the number of JSON pieces, after which
+            they are joined and written out by `render_to`.
+    """
+    flush_threshold = 1024
+
+    def __init__(self, *extras, indent=2, ndjson=False, **kwargs):
+        """
+        Args:
+            extras (list): allows subclasses to add even more custom tokens.
+            indent (int): the indentation of the JSON, or None for compact JSON
+                          on a single line.
+            ndjson (bool): whether to render a document as newline-delimited
+                           JSON: the document itself (with its footnotes, but
+                           without its children) on the first line, then each
+                           of its top-level blocks on a line of its own,
+                           in compact JSON.
+            **kwargs: additional parameters to be passed to the ancestor's
+                      constructor.
+        """
+        super().__init__(*extras, **kwargs)
+        self.indent = indent
+        self.ndjson = ndjson
+
     def render(self, token):
         """
         Returns the string representation of the AST.
 
-        Overrides super().render. Delegates the logic to get_ast.
+        Overrides super().render.
+        """
+        return ''.join(self.iter_json(token))
+
+    def render_to(self, token, output):
+        """
+        Writes the string representation of the AST to `output`, a file-like
+        object, one chunk at a time.
+        """
+        for chunk in self.iter_json(token):
+            output.write(chunk)
+
+    def iter_json(self, token):
+        """
+        Yields the string representation of the AST in chunks,
+        each line ending with a newline.
         """
-        return json.dumps(get_ast(token), indent=2) + '\n'
+        if self.ndjson and isinstance(token, block_token.Document):
+            yield from _iter_json(token, None, self.flush_threshold, with_children=False)
+            yield '\n'
+            for child in token.children:
+                yield from _iter_json(child, None, self.flush_threshold)
+                yield '\n'
+        else:
+            yield from _iter_json(token, self.indent, self.flush_threshold)
+            yield '\n'
 
     def __getattr__(self, name):
         return lambda token: ''
@@ -47,6 +104,81 @@ def get_ast(token):
     return node
 
 
+def _iter_json(token, indent, chunk_size, with_children=True):
+    """
+    Yields `json.dumps(get_ast(token), indent=indent)` (with compact
+    separators if `indent` is None) in chunks of `chunk_size` pieces,
+    without recursion.
+
+    The stack holds the pieces still to be written, in reverse order:
+    strings, and (token, depth) pairs still to be expanded.
+    """
+    out = []
+    key_separator = ': ' if indent is not None else ':'
+    encode = json.JSONEncoder(indent=indent, separators=(',', key_separator)).encode
+    stack = [(token, 0)]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            out.append(item)
+            continue
+        if len(out) >= chunk_size:
+            yield ''.join(out)
+            out.clear()
+        token, depth = item
+        pieces = _token_pieces(token, depth, indent, key_separator, encode, with_children)
+        stack.extend(reversed(pieces))
+        # only the token at the top is rendered without its children.
+        with_children = True
+    yield ''.join(out)
+
+
+def _token_pieces(token, depth, indent, key_separator, encode, with_children):
+    """
+    Returns the pieces of the JSON object of `token` at the nesting `depth`:
+    strings, and (token, depth) pairs for its header and children.
+    """
+    if indent is not None:
+        newline = '\n' + ' ' * (indent * (depth + 1))
+        child_newline = newline + ' ' * indent
+        closing_newline = '\n' + ' ' * (indent * depth)
+    else:
+        newline = child_newline = closing_newline = ''
+    field_start = ',' + newline + '"'
+    field_end = '"' + key_separator
+
+    pieces = ['{', newline, '"type"', key_separator, '"', token.__class__.__name__, '"']
+    attrs = vars(token)
+    names = [name for name in ('content', 'footnotes') if name in attrs]
+    names.extend(token.repr_attributes)
+    for name in names:
+        value = getattr(token, name)
+        if value.__class__ is str:
+            value = _encode_string(value)
+        else:
+            # nested objects are indented from the column of their key.
+            value = encode(value)
+            if indent is not None:
+                value = value.replace('\n', newline)
+        pieces.extend((field_start, name, field_end, value))
+    if 'header' in attrs:
+        pieces.extend((field_start, 'header', field_end, (token.header, depth + 1)))
+    children = token.children if with_children else None
+    if children is not None:
+        pieces.extend((field_start, 'children', field_end))
+        if children:
+            pieces.append('[')
+            separator = ''
+            for child in children:
+                pieces.extend((separator, child_newline, (child, depth + 2)))
+                separator = ','
+            pieces.extend((newline, ']'))
+        else:
+            pieces.append('[]')
+    pieces.extend((closing_newline, '}'))
+    return pieces
+
+
 ASTRenderer = AstRenderer
 """
 Deprecated name of the `AstRenderer` class.
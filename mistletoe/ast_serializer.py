@@ -0,0 +1,326 @@
+"""
+Compact binary serialization of token trees, e.g. for caching parsed
+documents between processes:
+
+    >>> from mistletoe import Document, ast_serializer
+    >>> data = ast_serializer.dumps(Document(fin))
+    >>> document = ast_serializer.loads(data)
+
+Loading creates the token instances directly, without parsing anything,
+and is much faster than parsing the source again. As parsing depends on the
+tokens added by renderers, a tree should be loaded for the same kind of
+renderer which it was parsed with. The token classes are only looked up in
+modules which are already imported, so the modules of custom tokens are to be
+imported before loading.
+
+The format consists of a header and a few tables of unsigned integers, all
+little-endian, each stored with the smallest width of 1, 2 or 4 bytes which
+fits all of its values:
+
+*   a string table (the character lengths of the strings,
+    then the strings themselves, joined and encoded with UTF-8);
+*   a type table (the indices of the strings 'module:qualname' naming
+    the token classes);
+*   a node table (the type index of each token, times 2, plus 1 if it has
+    a list of children), in pre-order;
+*   a parent table (1 + the index of the token in whose children each token
+    is, or 0);
+*   the attributes of each token, as a stream of integers: their number,
+    then the index of the name and the tagged value of each attribute.
+    Values can be None, booleans, integers (zigzag-encoded, or as strings
+    if they don't fit in 32 bits), strings, lists, tuples, dicts, or tokens
+    (by index, e.g. the header of a table).
+"""
+
+import struct
+import sys
+from array import array
+from mistletoe.token import Token
+
+
+__all__ = ['dumps', 'loads', 'dump', 'load']
+
+
+_TABLE_COUNT = 5
+_HEADER = struct.Struct('<5sBI{0}I{0}B'.format(_TABLE_COUNT))
+_MAGIC = b'MLAST'
+_VERSION = 2
+
+# tags of the attribute values
+_NONE, _FALSE, _TRUE, _INT, _STR, _LIST, _TUPLE, _DICT, _TOKEN, _BIG_INT = range(10)
+
+# attributes stored in the node and parent tables
+_TREE_ATTRIBUTES = ('_children', '_parent')
+
+# array typecodes by item size
+_TYPECODES = {array(typecode).itemsize: typecode for typecode in 'LIHB'}
+
+_MAX_INT = (1 << 32) - 1
+
+
+def dumps(token: Token) -> bytes:
+    """
+    Serializes the tree of tokens rooted at `token`.
+
+    Raises:
+        TypeError: if a token has an attribute of an unsupported type.
+        ValueError: if a token occurs more than once in the tree.
+    """
+    tokens, parents = _collect_tokens(token)
+    index = {id(token): i for i, token in enumerate(tokens)}
+    strings = {}
+
+    def intern(s):
+        i = strings.get(s)
+        if i is None:
+            i = strings[s] = len(strings)
+        return i
+
+    types = {}
+    node_types = []
+    ints = []
+    for token in tokens:
+        cls = token.__class__
+        type_index = types.get(cls)
+        if type_index is None:
+            type_index = types[cls] = len(types)
+        node_types.append(type_index * 2 + (token.children is not None))
+        attrs = [(name, value) for name, value in vars(token).items() if name not in _TREE_ATTRIBUTES]
+        ints.append(len(attrs))
+        for name, value in attrs:
+            ints.append(intern(name))
+            _encode(value, ints, intern, index)
+    type_names = [intern('{}:{}'.format(cls.__module__, cls.__qualname__)) for cls in types]
+
+    text = ''.join(strings).encode('utf-8', 'surrogatepass')
+    tables = [_pack(values) for values in ([len(s) for s in strings], type_names, node_types, parents, ints)]
+    header = _HEADER.pack(_MAGIC, _VERSION, len(text), *(len(table) for table in tables),
+                          *(table.itemsize for table in tables))
+    data = [header, _to_bytes(tables[0]), text]
+    data.extend(_to_bytes(table) for table in tables[1:])
+    return b''.join(data)
+
+
+def loads(data) -> Token:
+    """
+    Reconstructs a tree of tokens from the output of `dumps`.
+
+    Args:
+        data: a bytes-like object.
+
+    Raises:
+        ValueError: if `data` is not a serialized tree, or names a class
+                    which is not a token class of an imported module.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError('Not a serialized token tree.')
+    header = _HEADER.unpack_from(data)
+    magic, version, n_bytes = header[:3]
+    counts = header[3:3 + _TABLE_COUNT]
+    widths = header[3 + _TABLE_COUNT:]
+    if magic != _MAGIC:
+        raise ValueError('Not a serialized token tree.')
+    if version != _VERSION:
+        raise ValueError('Unsupported serialization version: {}.'.format(version))
+
+    offset = _HEADER.size
+    lengths, offset = _from_bytes(widths[0], data, offset, counts[0])
+    text = bytes(data[offset:offset + n_bytes]).decode('utf-8', 'surrogatepass')
+    offset += n_bytes
+    strings = _split_strings(text, lengths)
+    tables = []
+    for width, count in zip(widths[1:], counts[1:]):
+        table, offset = _from_bytes(width, data, offset, count)
+        tables.append(table)
+    type_names, node_types, parents, ints = tables
+    if offset != len(data) or not node_types or len(parents) != len(node_types):
+        raise ValueError('Corrupt serialized token tree.')
+
+    classes = [_resolve_class(strings[i]) for i in type_names]
+    new = object.__new__
+    tokens = [new(classes[node_type >> 1]) for node_type in node_types]
+    _link_children(tokens, node_types, parents)
+
+    values = iter(ints)
+    for token in tokens:
+        attrs = token.__dict__
+        for _ in range(next(values)):
+            name = strings[next(values)]
+            attrs[name] = _decode(values, strings, tokens)
+    return tokens[0]
+
+
+def dump(token: Token, fileobj):
+    """
+    Serializes the tree of tokens rooted at `token` to `fileobj`,
+    a binary file-like object.
+    """
+    fileobj.write(dumps(token))
+
+
+def load(fileobj) -> Token:
+    """
+    Reconstructs a tree of tokens from `fileobj`, a binary file-like object.
+    """
+    return loads(fileobj.read())
+
+
+def _collect_tokens(root):
+    """
+    Returns the tokens of the tree in pre-order, and for each of them,
+    1 + the index of the token in whose children it is (or 0), without
+    recursion. Tokens which are only referenced by attributes are included too.
+    """
+    tokens = []
+    parents = []
+    seen = set()
+    stack = [(root, 0)]
+    while stack:
+        token, parent = stack.pop()
+        if id(token) in seen:
+            raise ValueError('Token occurs more than once in the tree: {!r}'.format(token))
+        seen.add(id(token))
+        tokens.append(token)
+        parents.append(parent)
+        for name, value in vars(token).items():
+            if name not in _TREE_ATTRIBUTES:
+                stack.extend((referenced, 0) for referenced in _find_tokens(value))
+        if token.children:
+            stack.extend((child, len(tokens)) for child in reversed(token.children))
+    return tokens, parents
+
+
+def _find_tokens(value):
+    if isinstance(value, Token):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _find_tokens(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _find_tokens(item)
+
+
+def _encode(value, ints, intern, index):
+    cls = value.__class__
+    if cls is str:
+        ints.extend((_STR, intern(value)))
+    elif value is None:
+        ints.append(_NONE)
+    elif cls is bool:
+        ints.append(_TRUE if value else _FALSE)
+    elif cls is int:
+        ints.extend(_encode_int(value, intern))
+    elif cls is list or cls is tuple:
+        ints.extend((_LIST if cls is list else _TUPLE, len(value)))
+        for item in value:
+            _encode(item, ints, intern, index)
+    elif cls is dict:
+        ints.extend((_DICT, len(value)))
+        for key, item in value.items():
+            _encode(key, ints, intern, index)
+            _encode(item, ints, intern, index)
+    elif isinstance(value, Token):
+        ints.extend((_TOKEN, index[id(value)]))
+    else:
+        raise TypeError('Cannot serialize a token attribute of type {}.'.format(cls.__name__))
+
+
+def _encode_int(value, intern):
+    zigzag = value * 2 if value >= 0 else -value * 2 - 1
+    if zigzag <= _MAX_INT:
+        return _INT, zigzag
+    return _BIG_INT, intern(str(value))
+
+
+def _decode(values, strings, tokens):
+    tag = next(values)
+    if tag == _STR:
+        return strings[next(values)]
+    if tag == _NONE:
+        return None
+    if tag == _INT:
+        zigzag = next(values)
+        return -(zigzag >> 1) - 1 if zigzag & 1 else zigzag >> 1
+    if tag == _TRUE or tag == _FALSE:
+        return tag == _TRUE
+    if tag == _LIST or tag == _TUPLE:
+        items = [_decode(values, strings, tokens) for _ in range(next(values))]
+        return items if tag == _LIST else tuple(items)
+    if tag == _DICT:
+        result = {}
+        for _ in range(next(values)):
+            key = _decode(values, strings, tokens)
+            result[key] = _decode(values, strings, tokens)
+        return result
+    if tag == _TOKEN:
+        return tokens[next(values)]
+    if tag == _BIG_INT:
+        return int(strings[next(values)])
+    raise ValueError('Corrupt serialized token tree.')
+
+
+def _link_children(tokens, node_types, parents):
+    for token, node_type in zip(tokens, node_types):
+        if node_type & 1:
+            token._children = []
+    for token, parent in zip(tokens, parents):
+        if parent:
+            parent = tokens[parent - 1]
+            parent._children.append(token)
+            token._parent = parent
+
+
+def _split_strings(text, lengths):
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(text[start:start + length])
+        start += length
+    return strings
+
+
+def _resolve_class(name):
+    """
+    Returns the token class named by `name`, from a module which is already
+    imported: no modules are imported by loading.
+    """
+    module_name, _, qualname = name.partition(':')
+    cls = sys.modules.get(module_name)
+    for attr in qualname.split('.'):
+        cls = getattr(cls, attr, None)
+    if cls is None:
+        raise ValueError('Unknown token class (or its module is not imported): {}.'.format(name))
+    if not (isinstance(cls, type) and issubclass(cls, Token)):
+        raise ValueError('Not a token class: {}.'.format(name))
+    return cls
+
+
+def _pack(values):
+    """
+    Returns an array of the unsigned integers `values`, with the smallest
+    item size which fits all of them.
+    """
+    top = max(values, default=0)
+    itemsize = 1 if top < 1 << 8 else 2 if top < 1 << 16 else 4
+    return array(_TYPECODES[itemsize], values)
+
+
+def _to_bytes(values):
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(itemsize, data, offset, count):
+    if itemsize not in (1, 2, 4):
+        raise ValueError('Corrupt serialized token tree.')
+    values = array(_TYPECODES[itemsize])
+    end = offset + itemsize * count
+    if end > len(data):
+        raise ValueError('Corrupt serialized token tree.')
+    values.frombytes(data[offset:end])
+    if sys.byteorder == 'big' and itemsize > 1:
+        values.byteswap()
+    return values, end
@@ -3,6 +3,8 @@ Base class for renderers.
 """
 
 import re
+from functools import lru_cache
+from urllib.parse import quote
 from mistletoe import block_token, span_token
 
 
@@ -11,13 +13,14 @@ class BaseRenderer(object):
     Base class for renderers.
 
     All renderers should ...
-    *   ... define all render functions specified in self.render_map;
+    *   ... define render functions for all the tokens to be rendered;
     *   ... be a context manager (by inheriting __enter__ and __exit__);
 
     Custom renderers could ...
     *   ... add additional tokens into the parsing process by passing custom
         tokens to super().__init__();
-    *   ... add additional render functions by appending to self.render_map;
+    *   ... add additional render functions by defining them according to
+        the naming conventions below, or by adding them to self.render_map;
 
     Usage:
         Suppose SomeRenderer inherits BaseRenderer, and fin is the input file.
@@ -31,45 +34,54 @@ class BaseRenderer(object):
         See mistletoe.html_renderer for an implementation example.
 
     Naming conventions:
-        *   The keys of self.render_map should exactly match the class
-            name of tokens;
         *   Render function names should be of form: "render_" + the
-            "snake-case" form of token's class name.
+            "snake-case" form of token's class name;
+        *   The keys of self.render_map should exactly match the class
+            name of tokens.
+
+        Tokens without a render function of their own are rendered
+        by the render function of their nearest base class.
 
     Attributes:
-        render_map (dict): maps tokens to their corresponding render functions.
+        render_map (RenderMap): maps tokens to their corresponding render functions.
+        url_cache_size (int): the number of escaped URLs remembered by renderers
+                              with an `escape_url` method; see `__init__`.
         _extras (list): a list of custom tokens to be added to the
                         parsing process.
     """
     _parse_name = re.compile(r"([A-Z][a-z]+|[A-Z]+(?![a-z]))")
 
+    # render functions of tokens whose names do not follow the naming conventions.
+    _render_func_aliases = {
+        'SetextHeading': 'render_heading',
+        'CodeFence':     'render_block_code',
+    }
+
+    # tokens which have an entry in the render map of every renderer.
+    _render_map_tokens = (
+        'Strong', 'Emphasis', 'InlineCode', 'RawText', 'Strikethrough', 'Image', 'Link', 'AutoLink',
+        'EscapeSequence', 'Heading', 'SetextHeading', 'Quote', 'Paragraph', 'CodeFence', 'BlockCode',
+        'List', 'ListItem', 'Table', 'TableRow', 'TableCell', 'ThematicBreak', 'LineBreak', 'Document',
+    )
+
+    url_cache_size = 1024
+
     def __init__(self, *extras, **kwargs):
-        self.render_map = {
-            'Strong':         self.render_strong,
-            'Emphasis':       self.render_emphasis,
-            'InlineCode':     self.render_inline_code,
-            'RawText':        self.render_raw_text,
-            'Strikethrough':  self.render_strikethrough,
-            'Image':          self.render_image,
-            'Link':           self.render_link,
-            'AutoLink':       self.render_auto_link,
-            'EscapeSequence': self.render_escape_sequence,
-            'Heading':        self.render_heading,
-            'SetextHeading':  self.render_heading,
-            'Quote':          self.render_quote,
-            'Paragraph':      self.render_paragraph,
-            'CodeFence':      self.render_block_code,
-            'BlockCode':      self.render_block_code,
-            'List':           self.render_list,
-            'ListItem':       self.render_list_item,
-            'Table':          self.render_table,
-            'TableRow':       self.render_table_row,
-            'TableCell':      self.render_table_cell,
-            'ThematicBreak':  self.render_thematic_break,
-            'LineBreak':      self.render_line_break,
-            'Document':       self.render_document,
-        }
+        # the render map is only built when it is first accessed; until then,
+        # render functions are resolved by the naming conventions, which
+        # give the same functions as its default entries.
+        self._render_map = None
+        self._render_funcs = {}
         self._extras = extras
+        for token in extras:
+            if self._resolve_render_func_name(token)[0] is not token:
+                raise AttributeError('{} has no render function for {}.'.format(type(self).__name__, token.__name__))
+
+        # documents tend to repeat the same URLs, so the escaped URLs
+        # are memoized by each renderer instance. Statistics are available
+        # through `self.escape_url.cache_info()`.
+        if hasattr(self, 'escape_url'):
+            self.escape_url = lru_cache(maxsize=self.url_cache_size)(self.escape_url)
 
         for token in extras:
             if issubclass(token, span_token.SpanToken):
@@ -77,22 +89,135 @@ class BaseRenderer(object):
             else:
                 token_module = block_token
             token_module.add_token(token)
-            render_func = getattr(self, self._cls_to_func(token.__name__))
-            self.render_map[token.__name__] = render_func
 
         self.footnotes = {}
 
+    @property
+    def render_map(self):
+        """
+        Maps the class names of tokens to their render functions.
+
+        Entries take precedence over the naming conventions, also for
+        the subclasses of the tokens named.
+        """
+        if self._render_map is None:
+            render_map = {name: getattr(self, func_name) for name, func_name in self._default_render_func_names()}
+            for token in self._extras:
+                render_map[token.__name__] = getattr(self, self._resolve_render_func_name(token)[1])
+            self._render_map = RenderMap(self, render_map)
+        return self._render_map
+
+    @render_map.setter
+    def render_map(self, render_map):
+        self._render_funcs = {}
+        self._render_map = RenderMap(self, render_map)
+        self._render_map.modified = True
+
+    @classmethod
+    def _default_render_func_names(cls):
+        """
+        Returns the (token name, render method name) pairs of the default
+        entries of the render map, cached on the renderer class.
+        """
+        names = cls.__dict__.get('_render_map_func_names')
+        if names is None:
+            names = tuple((name, cls._render_func_name(name) or cls._cls_to_func(name))
+                          for name in cls._render_map_tokens)
+            setattr(cls, '_render_map_func_names', names)
+        return names
+
     def render(self, token):
         """
-        Grabs the class name from input token and finds its corresponding
-        render function.
+        Finds the render function for the class of the input token
+        and calls it.
 
-        Basically a janky way to do polymorphism.
+        The render function is resolved once per token class (see
+        `get_render_func`) and then cached.
 
         Arguments:
-            token: whose __class__.__name__ is in self.render_map.
+            token: a token whose class (or one of its base classes)
+                   has a render function.
+        """
+        render_func = self._render_funcs.get(token.__class__)
+        if render_func is None:
+            render_func = self.get_render_func(token.__class__)
+        return render_func(token)
+
+    def get_render_func(self, token_cls):
+        """
+        Returns the render function for tokens of the class `token_cls`.
+
+        The classes in the MRO of `token_cls` are tried in order: an entry in
+        `self.render_map` is used first, then a method named by the naming
+        conventions. Thus subclasses of tokens are rendered like their base
+        classes, unless they have a render function of their own.
+
+        Raises:
+            KeyError: if no render function is found.
+        """
+        render_func = self._render_funcs.get(token_cls)
+        if render_func is not None:
+            return render_func
+        klass, func_name = self._resolve_render_func_name(token_cls)
+        render_map = self._render_map
+        for base in token_cls.__mro__:
+            if render_map is not None and base.__name__ in render_map:
+                render_func = render_map[base.__name__]
+                break
+            if base is klass:
+                render_func = getattr(self, func_name)
+                break
+        else:
+            raise KeyError(token_cls.__name__)
+        self._render_funcs[token_cls] = render_func
+        return render_func
+
+    @classmethod
+    def _resolve_render_func_name(cls, token_cls):
+        """
+        Returns the first class in the MRO of `token_cls` with a render method
+        in this renderer class, and the name of that method;
+        or (None, None), if there is no such class.
+
+        The result is cached on the renderer class, so that it is only
+        computed once per token class, and not once per renderer instance.
+        """
+        cache = cls.__dict__.get('_render_func_names')
+        if cache is None:
+            cache = {}
+            setattr(cls, '_render_func_names', cache)
+        try:
+            return cache[token_cls]
+        except KeyError:
+            pass
+        result = None, None
+        for base in token_cls.__mro__:
+            func_name = cls._render_func_name(base.__name__)
+            if func_name is not None:
+                result = base, func_name
+                break
+        cache[token_cls] = result
+        return result
+
+    @classmethod
+    def _render_func_name(cls, cls_name):
+        """
+        Returns the name of the render method of tokens named `cls_name`,
+        or None, if this renderer class has no such method.
+        """
+        func_name = cls._render_func_aliases.get(cls_name) or cls._cls_to_func(cls_name)
+        return func_name if hasattr(cls, func_name) else None
+
+    def render_to(self, token, output):
         """
-        return self.render_map[token.__class__.__name__](token)
+        Renders the token and writes the result to `output`, a file-like
+        object (anything with a `write` method accepting strings),
+        e.g. an opened text file or `io.StringIO`.
+
+        Renderers may override this to build the output in pieces,
+        rather than as a single string returned by `render`.
+        """
+        output.write(self.render(token))
 
     def render_inner(self, token) -> str:
         """
@@ -209,3 +334,72 @@ class BaseRenderer(object):
 # reserved characters as per [RFC 3986](https://www.rfc-editor.org/rfc/rfc3986#section-2.2).
 # Plus we add the percent character (%) to avoid double-escaping.
 URI_SAFE_CHARACTERS = ":/?#[]@!$&'()*+,;=%"
+
+_uri_safe_pattern = re.compile(r"[A-Za-z0-9_.~\-" + re.escape(URI_SAFE_CHARACTERS) + "]*")
+
+
+def quote_url(raw: str) -> str:
+    """
+    Quotes the characters of `raw` which are unsafe in URLs, i.e. returns
+    `urllib.parse.quote(raw, safe=URI_SAFE_CHARACTERS)`, but checks
+    the common case of an URL with only safe characters first.
+    """
+    if _uri_safe_pattern.fullmatch(raw):
+        return raw
+    return quote(raw, safe=URI_SAFE_CHARACTERS)
+
+
+class RenderMap(dict):
+    """
+    Maps the class names of tokens to the render functions of a renderer.
+
+    A dict, which clears the render functions cached by the renderer
+    whenever it is changed.
+
+    Attributes:
+        modified (bool): whether the map has been changed after
+                         the construction of the renderer.
+    """
+    def __init__(self, renderer, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._renderer = renderer
+        self.modified = False
+
+    def _changed(self):
+        self._renderer._render_funcs.clear()
+        self.modified = True
+
+    def __setitem__(self, cls_name, render_func):
+        super().__setitem__(cls_name, render_func)
+        self._changed()
+
+    def __delitem__(self, cls_name):
+        super().__delitem__(cls_name)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, cls_name, render_func=None):
+        result = super().setdefault(cls_name, render_func)
+        self._changed()
+        return result
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._changed()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._changed()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._changed()
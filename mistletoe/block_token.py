@@ -2,9 +2,12 @@
 Built-in block-level token classes.
 """
 
+import mmap
 import re
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
 from itertools import zip_longest
-from typing import Iterable, Union
+from typing import Iterable, Optional, Union
 import mistletoe.block_tokenizer as tokenizer
 from mistletoe import token, span_token
 from mistletoe.core_tokens import (
@@ -110,10 +113,17 @@ class BlockToken(token.Token):
     Attributes:
         children (list): inner tokens.
         line_number (int): starting line (1-based).
+        end_line_number (int): ending line (1-based, inclusive), for tokens
+                               read directly from the input lines.
     """
     repr_attributes = ("line_number",)
 
     def __init__(self, lines, tokenize_func):
+        if _deferred_inline is not None and tokenize_func is span_token.tokenize_inner:
+            # parallel parsing (see Document): the children are grafted later.
+            _deferred_inline.append((self, lines))
+            self.children = []
+            return
         self.children = tokenize_func(lines)
 
     def __contains__(self, text):
@@ -136,29 +146,93 @@ class Document(BlockToken):
 
     Attributes:
         footnotes (dictionary): link reference definitions.
+        source_lines (list): the input lines (with normalized line endings),
+                             if they are kept, else None.
+        source_id (str): a unique id of the input lines, if they are kept,
+                         else None. The top-level blocks parsed from them
+                         carry the same `source_id`, which tells them apart
+                         from blocks parsed elsewhere.
+
+    Class attributes:
+        inline_chunk_size (int): when parsing in parallel, the approximate
+            number of characters of leaf block content sent to a worker process
+            in one task.
     """
+    inline_chunk_size = 65536
 
-    def __init__(self, lines: Union[str, Iterable[str]]):
+    def __init__(self, lines: Union[str, Iterable[str]],
+                 workers: Optional[Union[int, Executor]] = None,
+                 keep_source: bool = False):
         """
         Instantiates this token and its content by parsing the input lines.
 
         Args:
             lines: input markdown to be tokenized. If a string is provided,
-                it will be split into lines.
-
-                CAUTION: If the input lines end with Windows line endings (``\\r\\n``),
-                the parsing process will not work correctly. For performance reasons,
-                clients need to normalize such line endings themselves, before passing
-                them to this function, e.g. by calling ``lines.replace('\\r', '')``.
+                it will be split into lines. Windows (``\\r\\n``) and old Mac
+                (``\\r``) line endings are normalized to ``\\n``.
+            workers: if given, span-level parsing of leaf blocks (paragraphs,
+                headings, table cells) is distributed over worker processes.
+                Either the number of processes to start, or an existing
+                `concurrent.futures.Executor` which runs tasks in other
+                processes (e.g. a `ProcessPoolExecutor` reused across documents).
+                Custom span tokens must be importable by the worker processes.
+            keep_source: whether to keep the input lines, so that the blocks
+                which are not modified after parsing can be rendered back
+                verbatim (see `MarkdownRenderer`).
         """
         if isinstance(lines, str):
             lines = lines.splitlines(keepends=True)
-        lines = [line if line.endswith('\n') else '{}\n'.format(line) for line in lines]
+        lines = tokenizer.normalize_lines(lines)
+        self.source_lines = lines if keep_source else None
         self.footnotes = {}
         self.line_number = 1
         token._root_node = self
-        self.children = tokenize(lines)
-        token._root_node = None
+        try:
+            if workers:
+                self.children = _tokenize_parallel(lines, workers, self.inline_chunk_size)
+            else:
+                self.children = tokenize(lines)
+        finally:
+            token._root_node = None
+        self.source_id = uuid.uuid4().hex if keep_source else None
+        if keep_source:
+            for child in self.children:
+                child.source_id = self.source_id
+
+    @classmethod
+    def from_bytes(cls, data, encoding: str = 'utf-8', **kwargs) -> 'Document':
+        """
+        Parses encoded input, decoding it incrementally.
+
+        Args:
+            data: a bytes-like object, e.g. `bytes` or `mmap.mmap`.
+            encoding (str): the encoding of the input. A UTF-8 byte order mark
+                is skipped.
+            **kwargs: additional parameters to be passed to the constructor.
+        """
+        return cls(tokenizer.decode_lines(data, encoding), **kwargs)
+
+    @classmethod
+    def from_path(cls, path, encoding: str = 'utf-8', **kwargs) -> 'Document':
+        """
+        Parses a file. The file is memory-mapped and decoded incrementally,
+        rather than read into memory and decoded up front. Files which cannot
+        be memory-mapped (e.g. pipes) are read into memory instead.
+
+        Args:
+            path: path to the input file.
+            encoding (str): the encoding of the file. A UTF-8 byte order mark
+                is skipped.
+            **kwargs: additional parameters to be passed to the constructor.
+        """
+        with open(path, 'rb') as fin:
+            try:
+                data = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # empty files, pipes and some devices cannot be mapped
+                return cls.from_bytes(fin.read(), encoding, **kwargs)
+            with data:
+                return cls.from_bytes(data, encoding, **kwargs)
 
 
 class Heading(BlockToken):
@@ -834,6 +908,15 @@ class Footnote(BlockToken):
     and stored into the root node within `Footnote.read()`. We don't put instances of
     this class into the resulting AST.
     """
+    # the common, single-line form of a definition: [label]: dest "title"
+    # (without escapes, parentheses in the destination, or other special cases,
+    # which are handled by `match_reference`.)
+    simple_pattern = re.compile(r"""
+        [ ]{0,3}\[([^\[\]\\\n]+)\]:                        # label
+        [ \t]*(?:<([^<>\\\n]*)>|([^\s()<\\][^\s()\\]*))  # destination
+        (?:[ \t]+("[^"\\\n]*"|'[^'\\\n]*'|\([^()\\\n]*\)))?  # title
+        [ \t]*\n""", re.VERBOSE)
+
     def __new__(cls, _):
         return None
 
@@ -852,16 +935,40 @@ class Footnote(BlockToken):
         offset = 0
         matches = []
         while offset < len(string) - 1:
-            match_info = cls.match_reference(string, offset)
+            match_info = cls.match_simple_reference(string, offset) or cls.match_reference(string, offset)
             if match_info is None:
                 # backtrack the lines that have not been consumed
-                lines._index -= string[offset:].count('\n')
+                lines.set_pos(lines.get_pos() - string.count('\n', offset))
                 break
             offset, match = match_info
             matches.append(match)
         cls.append_footnotes(matches, token._root_node)
         return matches or None
 
+    @classmethod
+    def match_simple_reference(cls, string, offset):
+        """
+        Fast path of `match_reference`, for definitions matching `simple_pattern`.
+        """
+        match_obj = cls.simple_pattern.match(string, offset)
+        if match_obj is None:
+            return None
+        label, angle_dest, dest, title = match_obj.groups()
+        if label.strip() == '':
+            return None
+        if dest is None:
+            dest, dest_type = angle_dest, "angle_uri"
+        else:
+            dest_type = "uri"
+        end = match_obj.end()
+        if title is None:
+            # the title may still follow on the next line
+            title_start = shift_whitespace(string, end)
+            if title_start < len(string) and string[title_start] in '"\'(':
+                return None
+            return end, (label, dest, "", dest_type, None)
+        return end, (label, dest, title[1:-1], dest_type, title[0])
+
     @classmethod
     def match_reference(cls, string, offset):
         # up to three spaces, "[", label, "]"
@@ -934,7 +1041,8 @@ class Footnote(BlockToken):
         """
         start = -1
         escaped = False
-        for i, c in enumerate(string[offset:], start=offset):
+        for i in range(offset, len(string)):
+            c = string[i]
             if escaped:
                 escaped = False
             elif c == '\\':
@@ -958,7 +1066,8 @@ class Footnote(BlockToken):
     def match_link_dest(cls, string, offset):
         if string[offset] == '<':
             escaped = False
-            for i, c in enumerate(string[offset + 1:], start=offset + 1):
+            for i in range(offset + 1, len(string)):
+                c = string[i]
                 if c == '\\' and not escaped:
                     escaped = True
                 elif c == '\n' or (c == '<' and not escaped):
@@ -971,7 +1080,8 @@ class Footnote(BlockToken):
         else:
             escaped = False
             count = 0
-            for i, c in enumerate(string[offset:], start=offset):
+            for i in range(offset, len(string)):
+                c = string[i]
                 if c == '\\' and not escaped:
                     escaped = True
                 elif c in whitespace:
@@ -1002,7 +1112,8 @@ class Footnote(BlockToken):
         else:
             return None
         escaped = False
-        for i, c in enumerate(string[offset + 1:], start=offset + 1):
+        for i in range(offset + 1, len(string)):
+            c = string[i]
             if c == '\\' and not escaped:
                 escaped = True
             elif c == closing and not escaped:
@@ -1050,11 +1161,18 @@ class HtmlBlock(BlockToken):
     This is a leaf block token with a single child of type span_token.RawText,
     which holds the raw HTML content.
     """
-    _end_cond = None
-    multiblock = re.compile(r'<(pre|script|style|textarea)[ >\n]')
-    predefined = re.compile(r'<\/?(.+?)(?:\/?>|[ \n])')
-    custom_tag = re.compile(r'(?:' + '|'.join((span_token._open_tag,
-                                span_token._closing_tag)) + r')\s*$')
+    # a single classifier for the HTML block start conditions, tried in order.
+    # the name of the matching group tells the rule number.
+    start_pattern = re.compile(r"""\s{0,3}(?:
+        <(?P<rule1>pre|script|style|textarea)[ >\n]  # literal content
+        | (?P<rule2><!--)                         # comment
+        | (?P<rule3><\?)                          # processing instruction
+        | (?P<rule4><![A-Z])                      # declaration
+        | (?P<rule5><!\[CDATA\[)                  # CDATA section
+        | (?P<rule6></?(?i:""" + '|'.join(sorted(span_token._tags)) + r""")(?:/?>|[ \n]))  # predefined tags
+        | (?P<rule7>(?:""" + span_token._open_tag + '|' + span_token._closing_tag + r""")\s*$)  # any other tag
+        )""", re.VERBOSE)
+    end_conditions = {2: '-->', 3: '?>', 4: '>', 5: ']]>'}
 
     def __init__(self, lines):
         self.children = (span_token.RawText(''.join(lines).rstrip('\n')),)
@@ -1064,43 +1182,26 @@ class HtmlBlock(BlockToken):
         """Returns the raw HTML content."""
         return self.children[0].content
 
+    @classmethod
+    def classify(cls, line):
+        """
+        Returns a tuple (rule number, end condition) if the line starts an HTML block,
+        otherwise None. The end condition is None for blocks ending at a blank line.
+        """
+        if line.find('<', 0, 4) == -1:
+            return None
+        match_obj = cls.start_pattern.match(line)
+        if match_obj is None:
+            return None
+        rule = int(match_obj.lastgroup[-1])
+        if rule == 1:
+            return rule, '</{}>'.format(match_obj.group('rule1'))
+        return rule, cls.end_conditions.get(rule)
+
     @classmethod
     def start(cls, line):
-        stripped = line.lstrip()
-        if len(line) - len(stripped) >= 4:
-            return False
-        # rule 1: HTML tags designed to contain literal content, allow newlines in block
-        match_obj = cls.multiblock.match(stripped)
-        if match_obj is not None:
-            cls._end_cond = '</{}>'.format(match_obj.group(1).casefold())
-            return 1
-        # rule 2: html comment tags, allow newlines in block
-        if stripped.startswith('<!--'):
-            cls._end_cond = '-->'
-            return 2
-        # rule 3: tags that starts with <?, allow newlines in block
-        if stripped.startswith('<?'):
-            cls._end_cond = '?>'
-            return 3
-        # rule 4: tags that starts with <!, allow newlines in block
-        if stripped.startswith('<!') and stripped[2].isupper():
-            cls._end_cond = '>'
-            return 4
-        # rule 5: CDATA declaration, allow newlines in block
-        if stripped.startswith('<![CDATA['):
-            cls._end_cond = ']]>'
-            return 5
-        # rule 6: predefined tags (see html_token._tags), read until newline
-        match_obj = cls.predefined.match(stripped)
-        if match_obj is not None and match_obj.group(1).casefold() in span_token._tags:
-            cls._end_cond = None
-            return 6
-        # rule 7: custom tags, read until newline
-        match_obj = cls.custom_tag.match(stripped)
-        if match_obj is not None:
-            cls._end_cond = None
-            return 7
-        return False
+        rule_info = cls.classify(line)
+        return rule_info[0] if rule_info is not None else False
 
     @classmethod
     def check_interrupts_paragraph(cls, lines):
@@ -1109,12 +1210,13 @@ class HtmlBlock(BlockToken):
 
     @classmethod
     def read(cls, lines):
+        _, end_cond = cls.classify(lines.peek())
         # note: stop condition can trigger on the starting line
         line_buffer = []
         for line in lines:
             line_buffer.append(line)
-            if cls._end_cond is not None:
-                if cls._end_cond in line.casefold():
+            if end_cond is not None:
+                if end_cond in line.casefold():
                     break
             elif line.strip() == '':
                 line_buffer.pop()
@@ -1129,5 +1231,79 @@ Deprecated name of the `HtmlBlock` class.
 """
 
 
+def _tokenize_parallel(lines, workers, chunk_size):
+    """
+    Like `tokenize`, but the span-level parsing of leaf blocks is done
+    by worker processes, once all link reference definitions are known.
+    """
+    global _deferred_inline
+    parse_buffer = tokenizer.tokenize_block(lines, _token_types)
+    _deferred_inline = deferred = []
+    try:
+        tokens = tokenizer.make_tokens(parse_buffer)
+    finally:
+        _deferred_inline = None
+
+    chunks = []
+    size = chunk_size
+    for leaf, content in deferred:
+        if size >= chunk_size:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(content)
+        size += len(content)
+    if len(chunks) < 2:
+        results = [_tokenize_inner_chunk(chunk, span_token._token_types, token._root_node.footnotes)
+                   for chunk in chunks]
+    elif isinstance(workers, Executor):
+        results = _map_chunks(workers, chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = _map_chunks(executor, chunks)
+
+    children = (child_list for result in results for child_list in result)
+    for (leaf, _), child_list in zip(deferred, children):
+        leaf.children = child_list
+    return tokens
+
+
+def _map_chunks(executor, chunks):
+    span_token_types = list(span_token._token_types)
+    footnotes = token._root_node.footnotes
+    futures = [executor.submit(_tokenize_inner_chunk, chunk, span_token_types, footnotes)
+               for chunk in chunks]
+    return [future.result() for future in futures]
+
+
+class _FootnoteRoot:
+    """
+    Stands in for the `Document` when parsing span tokens in a worker process.
+    """
+    def __init__(self, footnotes):
+        self.footnotes = footnotes
+
+
+def _tokenize_inner_chunk(contents, span_token_types, footnotes):
+    """
+    Worker process entry point; parses a list of leaf block contents into lists
+    of span tokens, using the span token types of the parent process.
+    """
+    global _deferred_inline
+    _deferred_inline = None
+    saved_token_types, saved_root = span_token._token_types, token._root_node
+    span_token._token_types = list(span_token_types)
+    token._root_node = _FootnoteRoot(footnotes)
+    try:
+        return [span_token.tokenize_inner(content) for content in contents]
+    finally:
+        span_token._token_types, token._root_node = saved_token_types, saved_root
+
+
+"""
+Collects (leaf block token, content) pairs whose span-level parsing is deferred.
+`None` unless a `Document` is being parsed in parallel.
+"""
+_deferred_inline = None
+
 _token_types = []
 reset_tokens()
@@ -2,6 +2,8 @@
 Block-level tokenizer for mistletoe.
 """
 
+import codecs
+
 
 class FileWrapper:
     def __init__(self, lines, start_line=1):
@@ -52,6 +54,71 @@ class FileWrapper:
         return self.start_line + self._index
 
 
+def decode_lines(data, encoding='utf-8', chunk_size=65536):
+    """
+    Decodes a bytes-like object (e.g. `bytes` or `mmap.mmap`) into lines,
+    one chunk at a time, so that the whole decoded text is never held in memory
+    as a single string in addition to the encoded data.
+
+    Lines are split only at ``\\n``, not at the other line boundaries of
+    `str.splitlines` (e.g. form feeds), like reading a file in text mode;
+    ``\\r`` line endings are left to `normalize_lines`.
+    With UTF-8, a leading byte order mark is skipped.
+
+    Args:
+        data: the encoded input.
+        encoding (str): the encoding of the input.
+        chunk_size (int): the number of bytes decoded at once.
+    """
+    if codecs.lookup(encoding).name == 'utf-8':
+        encoding = 'utf-8-sig'
+    decoder = codecs.getincrementaldecoder(encoding)()
+    parts = []
+    for offset in range(0, len(data), chunk_size):
+        text = decoder.decode(data[offset:offset + chunk_size])
+        if not text:
+            continue
+        parts.append(text)
+        if '\n' not in text:
+            # no complete line yet (most likely)
+            continue
+        lines = ''.join(parts).split('\n')
+        # the last line is incomplete
+        parts = [lines.pop()]
+        for line in lines:
+            yield line + '\n'
+    parts.append(decoder.decode(b'', final=True))
+    last = ''.join(parts)
+    if last:
+        yield last
+
+
+def normalize_lines(lines):
+    """
+    Returns a list of the input lines, each ending with exactly one ``\\n``.
+
+    Line endings ``\\r\\n`` and ``\\r`` are converted to ``\\n``, splitting
+    a line if it contains a ``\\r`` in the middle. Lines without any ``\\r``
+    (the common case) are taken over as they are.
+
+    Args:
+        lines (iterable): user input lines.
+    """
+    result = []
+    for line in lines:
+        if '\r' in line:
+            line = line.replace('\r\n', '\n').replace('\r', '\n')
+            parts = line.split('\n')
+            if parts[-1] == '':
+                parts.pop()
+            result.extend(part + '\n' for part in parts)
+        elif line.endswith('\n'):
+            result.append(line)
+        else:
+            result.append(line + '\n')
+    return result
+
+
 def tokenize(iterable, token_types):
     """
     Searches for token_types in iterable.
@@ -68,7 +135,7 @@ def tokenize(iterable, token_types):
 
 def tokenize_block(iterable, token_types, start_line=1):
     """
-    Returns a list of tuples (token_type, read_result, line_number).
+    Returns a list of tuples (token_type, read_result, line_number, end_line_number).
 
     Footnotes are parsed here, but span-level parsing has not
     started yet.
@@ -82,7 +149,7 @@ def tokenize_block(iterable, token_types, start_line=1):
                 line_number = lines.line_number() + 1
                 result = token_type.read(lines)
                 if result is not None:
-                    parse_buffer.append((token_type, result, line_number))
+                    parse_buffer.append((token_type, result, line_number, lines.line_number()))
                     break
         else:  # unmatched newlines
             next(lines)
@@ -93,17 +160,19 @@ def tokenize_block(iterable, token_types, start_line=1):
 
 def make_tokens(parse_buffer):
     """
-    Takes a list of tuples (token_type, read_result, line_number),
-    applies token_type(read_result), and sets the line_number attribute.
+    Takes a list of tuples (token_type, read_result, line_number, end_line_number),
+    applies token_type(read_result), and sets the line_number and
+    end_line_number attributes.
 
     Footnotes are already parsed before this point,
     and span-level parsing is started here.
     """
     tokens = []
-    for token_type, result, line_number in parse_buffer:
+    for token_type, result, line_number, end_line_number in parse_buffer:
         token = token_type(result)
         if token is not None:
             token.line_number = line_number
+            token.end_line_number = end_line_number
             tokens.append(token)
     return tokens
 
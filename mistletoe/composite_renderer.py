@@ -0,0 +1,79 @@
+"""
+Rendering one document into several output formats: one parse, N traversals.
+"""
+
+from mistletoe import block_token, span_token
+from mistletoe.base_renderer import BaseRenderer
+
+
+class CompositeRenderer(BaseRenderer):
+    """
+    Renders a document with several renderers: one parse, N traversals.
+
+    The renderers are created together, so that the tokens added by any of
+    them take part in the parsing process at the same time, and the document
+    needs to be parsed only once for all the output formats. Each renderer
+    should thus be able to render the tokens added by the others, e.g.
+    HTML tokens added by `HtmlRenderer`; renderers which remove tokens from
+    the parsing process (like `MarkdownRenderer`) don't mix well with others.
+
+    The tree is then traversed once per renderer, as render functions render
+    the children of their tokens by themselves, within the context set up by
+    their parents (e.g. the tightness of the enclosing list in HTML).
+    Walking the tree only once, and dispatching each token to all of the
+    renderers, would need render functions which don't recurse by themselves;
+    this is left as follow-up work.
+
+    Usage:
+        >>> from functools import partial
+        >>> from mistletoe import Document, HtmlRenderer
+        >>> from mistletoe.contrib.toc_renderer import TocRenderer
+        >>> with CompositeRenderer(HtmlRenderer, partial(TocRenderer, depth=3)) as renderer:
+        ...     html, toc_html = renderer.render(Document(fin))
+        ...     toc = renderer.renderers[1].toc
+
+    Attributes:
+        renderers (list): the renderer instances, in the given order.
+    """
+    def __init__(self, *renderer_factories):
+        """
+        Args:
+            renderer_factories (list): renderer classes, or other callables
+                which return a renderer when called with no arguments
+                (e.g. `functools.partial(HtmlRenderer, process_html_tokens=False)`).
+        """
+        self.renderers = [factory() for factory in renderer_factories]
+        super().__init__()
+        # renderers of the same family add the same tokens more than once.
+        block_token._token_types[:] = _unique(block_token._token_types)
+        span_token._token_types[:] = _unique(span_token._token_types)
+
+    def render(self, token):
+        """
+        Renders `token` with each of the renderers.
+
+        Returns:
+            the list of the rendered outputs, in the order of the renderers.
+        """
+        return [renderer.render(token) for renderer in self.renderers]
+
+    def render_to(self, token, outputs):
+        """
+        Renders `token` with each of the renderers, and writes the results
+        to the corresponding file-like objects in `outputs`.
+        """
+        if len(outputs) != len(self.renderers):
+            raise ValueError('Expected {} outputs, got {}.'.format(len(self.renderers), len(outputs)))
+        for renderer, output in zip(self.renderers, outputs):
+            renderer.render_to(token, output)
+
+    def __exit__(self, *args):
+        for renderer in self.renderers:
+            renderer.__exit__(*args)
+        super().__exit__(*args)
+
+
+def _unique(token_types):
+    seen = set()
+    return [token_type for token_type in token_types
+            if not (token_type in seen or seen.add(token_type))]
@@ -23,9 +23,15 @@
 
 from itertools import chain
 from mistletoe import block_token, span_token
-from mistletoe.base_renderer import BaseRenderer, URI_SAFE_CHARACTERS
+from mistletoe.base_renderer import BaseRenderer, quote_url
 import re
 
+# The following regex tries to find special chars that are one of the following:
+# 1. the whole string (typically in an EscapeSequence)
+# 2. just after a non-whitespace
+# 3. just before a non-whitespace
+_special_chars = re.compile(r'^{esc_chars}$|(?<=\S){esc_chars}|{esc_chars}(?=\S)'.format(esc_chars=r'[{}\[\]\-*_+^~]'))
+
 
 class JiraRenderer(BaseRenderer):
     """
@@ -66,7 +72,7 @@ class JiraRenderer(BaseRenderer):
     def render_link(self, token):
         template = '[{inner}|{target}{title}]'
         inner = self.render_inner(token)
-        target = escape_url(token.target)
+        target = self.escape_url(token.target)
         if token.title:
             title = '|{}'.format(escape_link_chars(token.title))
         else:
@@ -76,7 +82,7 @@ class JiraRenderer(BaseRenderer):
 
     def render_auto_link(self, token):
         template = '[{target}]'
-        target = escape_url(token.target)
+        target = self.escape_url(token.target)
         return template.format(target=target)
 
     def render_escape_sequence(self, token):
@@ -84,15 +90,7 @@ class JiraRenderer(BaseRenderer):
 
     def render_raw_text(self, token, escape=True):
         if escape:
-            def repl(match):
-                return '\\' + match.group(0)
-            # The following regex tries to find special chars that are one of the following:
-            # 1. the whole string (typically in an EscapeSequence)
-            # 2. just after a non-whitespace
-            # 3. just before a non-whitespace
-            re_esc_chars = r'[{}\[\]\-*_+^~]'
-            re_find = r'(^{esc_chars}$)|((?<=\S)({esc_chars}))|(({esc_chars})(?=\S))'.format(esc_chars=re_esc_chars)
-            return re.sub(re_find, repl, token.content)
+            return _special_chars.sub(_escape_special_chars, token.content)
         else:
             return token.content
 
@@ -131,7 +129,9 @@ class JiraRenderer(BaseRenderer):
         return template.format(attr=attr, inner=inner)
 
     def render_list(self, token):
+        self.listTokens.append('#' if token.start else '*')
         inner = self.render_inner(token)
+        del (self.listTokens[-1])
         return inner + self._block_eol(token)[0:-1]
 
     def render_list_item(self, token):
@@ -140,20 +140,6 @@ class JiraRenderer(BaseRenderer):
         result = template.format(prefix=prefix, inner=self.render_inner(token))
         return result
 
-    def render_inner(self, token):
-        if isinstance(token, block_token.List):
-            if token.start:
-                self.listTokens.append('#')
-            else:
-                self.listTokens.append('*')
-
-        rendered = [self.render(child) for child in token.children]
-
-        if isinstance(token, block_token.List):
-            del (self.listTokens[-1])
-
-        return ''.join(rendered)
-
     def render_table(self, token):
         # This is actually gross and I wonder if there's a better way to do it.
         #
@@ -214,6 +200,10 @@ class JiraRenderer(BaseRenderer):
         self.footnotes.update(token.footnotes)
         return self.render_inner(token)
 
+    @staticmethod
+    def escape_url(raw):
+        return escape_url(raw)
+
     def _block_eol(self, token):
         """
         Jira syntax is very limited when it comes to lists: whenever
@@ -229,12 +219,15 @@ class JiraRenderer(BaseRenderer):
         )
 
 
+def _escape_special_chars(match):
+    return '\\' + match.group()
+
+
 def escape_url(raw):
     """
     Escapes the URL part of a Jira link.
     """
-    from urllib.parse import quote
-    return escape_link_chars(quote(raw, safe=URI_SAFE_CHARACTERS))
+    return escape_link_chars(quote_url(raw))
 
 
 def escape_link_chars(s: str) -> str:
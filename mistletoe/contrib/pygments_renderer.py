@@ -1,4 +1,9 @@
-from mistletoe import HtmlRenderer
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from mistletoe import HtmlRenderer, block_token
+from mistletoe.utils import traverse
 from pygments import highlight
 from pygments.formatters.html import HtmlFormatter
 from pygments.lexers import get_lexer_by_name as get_lexer, guess_lexer
@@ -7,10 +12,36 @@ from pygments.util import ClassNotFound
 
 
 class PygmentsRenderer(HtmlRenderer):
-    formatter = HtmlFormatter()
-    formatter.noclasses = True
+    """
+    Extends HtmlRenderer to highlight code blocks with Pygments.
 
-    def __init__(self, *extras, style='default', fail_on_unsupported_language=False, **kwargs):
+    Lexers are looked up only once per language, and the highlighted code
+    blocks are remembered in an LRU cache shared by all instances (see
+    `highlight_cache_info()`), as the same snippets tend to repeat
+    across the pages of a documentation.
+
+    Code blocks can also be highlighted in parallel by worker processes,
+    see `highlight_blocks()`.
+
+    By default, the highlighted code carries inline styles. With
+    `inline_styles=False`, it carries CSS classes instead, which is much
+    more compact; the stylesheet for them is given by `get_style_defs()`.
+
+    Attributes:
+        formatter (pygments.formatters.html.HtmlFormatter): the formatter of
+                  this renderer.
+    """
+
+    def __init__(
+        self,
+        *extras,
+        style='default',
+        fail_on_unsupported_language=False,
+        fallback_lexer=None,
+        workers=None,
+        inline_styles=True,
+        **kwargs
+    ):
         """
         Args:
             extras (list): allows subclasses to add even more custom tokens.
@@ -19,26 +50,203 @@ class PygmentsRenderer(HtmlRenderer):
             fail_on_unsupported_language (bool): whether to let Pygments' `ClassNotFound`
                       be thrown when there is an unsupported language found on
                       a code block.
-                      If `False`, then language is guessed instead of throwing the error.
+                      If `False`, then the fallback lexer is used instead of throwing the error.
+            fallback_lexer (str or pygments.lexer.Lexer): the lexer (or its short name)
+                      for code blocks with no language or an unsupported one.
+                      If `None`, the language is guessed by Pygments, which is
+                      much slower.
+            workers (int or concurrent.futures.Executor): if given, the code blocks
+                      of each rendered document are highlighted in parallel first,
+                      by `highlight_blocks()` with these workers.
+            inline_styles (bool): whether to style the highlighted code with inline
+                      `style` attributes, or with CSS classes.
             **kwargs: additional parameters to be passed to the ancestor's
                       constructor.
         """
         super().__init__(*extras, **kwargs)
-        self.formatter.style = get_style(style)
+        self.formatter = HtmlFormatter(style=get_style(style), noclasses=inline_styles)
         self.fail_on_unsupported_language = fail_on_unsupported_language
+        if isinstance(fallback_lexer, str):
+            fallback_lexer = get_lexer(fallback_lexer)
+        self.fallback_lexer = fallback_lexer
+        self.workers = workers
+        self._highlighted = {}
+
+    def __exit__(self, *args):
+        self._highlighted.clear()
+        super().__exit__(*args)
+
+    def render_document(self, token):
+        if self.workers:
+            self.highlight_blocks([token], self.workers)
+        return super().render_document(token)
 
     def render_block_code(self, token):
         code = token.content
-        lexer = None
+        lexer = self._get_lexer(token)
+        key = self._cache_key(token)
+        rendered = self._highlighted.get(key) or _highlight_cache.get(key)
+        if rendered is None:
+            if lexer is None:
+                lexer = self.fallback_lexer or guess_lexer(code)
+            rendered = highlight(code, lexer, self.formatter)
+            _highlight_cache.put(key, rendered)
+        return rendered
+
+    def highlight_blocks(self, tokens, workers=None):
+        """
+        Highlights the code blocks within `tokens` (e.g. a batch of documents)
+        in worker processes, and keeps the results for rendering them, until
+        the end of the `with` block of this renderer.
+
+        Args:
+            tokens (list): tokens whose code blocks should be highlighted.
+            workers (int or concurrent.futures.Executor): either an executor to
+                submit the work to, or the number of worker processes to start
+                (`None` for as many as there are CPUs).
+        """
+        blocks = {}
+        for token in tokens:
+            for result in traverse(token, klass=(block_token.BlockCode, block_token.CodeFence), include_source=True):
+                block = result.node
+                key = self._cache_key(block)
+                if key in blocks or key in self._highlighted or key in _highlight_cache:
+                    continue
+                try:
+                    blocks[key] = (block.content, self._get_lexer(block))
+                except ClassNotFound:
+                    pass  # raised again when rendering the block
+        if len(blocks) < 2:
+            return
+
+        keys = list(blocks)
+        # a few chunks per worker balance the load. The number of workers
+        # of a given executor is unknown, so it is taken to be the CPU count.
+        worker_count = workers if isinstance(workers, int) else os.cpu_count() or 1
+        chunk_count = 4 * worker_count
+        chunk_size = -(-len(keys) // chunk_count)
+        chunks = [[blocks[key] for key in keys[i:i + chunk_size]] for i in range(0, len(keys), chunk_size)]
+        if isinstance(workers, Executor):
+            results = _map_chunks(workers, chunks, self.fallback_lexer, self.formatter)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = _map_chunks(executor, chunks, self.fallback_lexer, self.formatter)
+        self._highlighted.update(zip(keys, results))
+
+    def _get_lexer(self, token):
+        """
+        Returns the lexer for the language of `token`, or `None`, if it has
+        no language or an unsupported one, and we don't fail on those.
+        """
+        lexer = _get_cached_lexer(token.language) if token.language else None
+        if lexer is None and token.language and self.fail_on_unsupported_language:
+            raise ClassNotFound('no lexer for alias {!r} found'.format(token.language))
+        return lexer
+
+    def _cache_key(self, token):
+        """
+        Returns the key of the highlighted code of `token`, which depends on
+        the attributes of the formatter and the fallback lexer as they are now,
+        so that changing them after construction is taken into account.
+        """
+        return (token.language, _freeze_attributes(self.formatter),
+                _freeze_attributes(self.fallback_lexer), token.content)
+
+    def get_style_defs(self, arg=None):
+        """
+        Returns the CSS rules for the highlighted code, to be included once
+        in the stylesheet of the site, when rendering with `inline_styles=False`.
+
+        Args:
+            arg (str or list): the CSS selector(s) to prefix the rules with,
+                  by default the CSS class of the highlighted code blocks
+                  ('.highlight').
+        """
+        return self.formatter.get_style_defs('.' + self.formatter.cssclass if arg is None else arg)
+
+    @staticmethod
+    def highlight_cache_info():
+        """
+        Returns the statistics of the cache of highlighted code blocks,
+        like `functools.lru_cache` does: (hits, misses, maxsize, currsize).
+        """
+        return _highlight_cache.info()
+
+
+_CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _LruCache:
+    """
+    A mapping of bounded size, which discards the least recently used items
+    first, and counts the hits and misses of its lookups.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key):
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._items[key] = value
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def info(self):
+        return _CacheInfo(self.hits, self.misses, self.maxsize, len(self._items))
+
+
+_highlight_cache = _LruCache(1024)
+
+
+def _map_chunks(executor, chunks, fallback_lexer, formatter):
+    futures = [executor.submit(_highlight_chunk, chunk, fallback_lexer, formatter) for chunk in chunks]
+    return [rendered for future in futures for rendered in future.result()]
+
+
+def _highlight_chunk(blocks, fallback_lexer, formatter):
+    """
+    Highlights the (code, lexer) pairs in `blocks`, in a worker process.
+    """
+    return [highlight(code, lexer or fallback_lexer or guess_lexer(code), formatter)
+            for code, lexer in blocks]
+
+
+# attributes of formatters and lexers which are either left as given to the
+# constructor, or derived from other attributes when constructing them.
+_UNKEYED_ATTRIBUTES = frozenset(('options', 'ttype2class', 'class2style', 'span_element_openers'))
+
 
-        if token.language:
-            try:
-                lexer = get_lexer(token.language)
-            except ClassNotFound as err:
-                if self.fail_on_unsupported_language:
-                    raise err
+def _freeze_attributes(obj):
+    """
+    Returns the class and the public attributes of `obj` (a formatter or a lexer),
+    on which the highlighted code depends, in a hashable form.
+    """
+    if obj is None:
+        return None
+    return (type(obj),) + tuple(sorted((name, repr(value)) for name, value in vars(obj).items()
+                                       if name not in _UNKEYED_ATTRIBUTES and not name.startswith('_')))
 
-        if lexer is None:
-            lexer = guess_lexer(code)
 
-        return highlight(code, lexer, self.formatter)
+@lru_cache(maxsize=256)
+def _get_cached_lexer(language):
+    """
+    Returns the lexer for `language`, or `None`, if Pygments doesn't know it.
+    """
+    try:
+        return get_lexer(language)
+    except ClassNotFound:
+        return None
@@ -6,7 +6,8 @@ See `if __name__ == '__main__'` section for sample usage.
 
 import re
 from mistletoe.html_renderer import HtmlRenderer
-from mistletoe import block_token
+from mistletoe import block_token, span_token
+from mistletoe.utils import plain_text
 
 
 class TocRenderer(HtmlRenderer):
@@ -34,42 +35,69 @@ class TocRenderer(HtmlRenderer):
     def toc(self):
         """
         Returns table of contents as a block_token.List instance.
-        """
-        def get_indent(level):
-            if self.omit_title:
-                level -= 1
-            return ' ' * 4 * (level - 1)
-
-        def build_list_item(heading):
-            level, content = heading
-            template = '{indent}- {content}\n'
-            return template.format(indent=get_indent(level), content=content)
 
-        lines = [build_list_item(heading) for heading in self._headings]
-        items = block_token.tokenize(lines)
-        return items[0]
+        The list is built directly from the collected headings: headings of
+        a deeper level are nested in a list within the item of the preceding
+        heading.
+        """
+        items = []  # (content, subitems) pairs
+        stack = []  # (level, items) pairs of the lists which can still get items
+        for level, content in self._headings:
+            while len(stack) > 1 and level < stack[-1][0]:
+                stack.pop()
+            if not stack:
+                stack.append((level, items))
+            elif level > stack[-1][0]:
+                # the subitems of the last item may already hold deeper
+                # headings, e.g. for '#', '###', '##'.
+                stack.append((level, stack[-1][1][-1][1]))
+            stack[-1][1].append((content, []))
+        return _make_list(items)
 
     def render_heading(self, token):
         """
-        Overrides super().render_heading; stores rendered heading first,
-        then returns it.
+        Overrides super().render_heading; stores the text of the heading
+        first, then returns the rendered heading.
         """
-        rendered = super().render_heading(token)
-        content = self.parse_rendered_heading(rendered)
+        content = plain_text(token)
         if not (self.omit_title and token.level == 1
                 or token.level > self.depth
                 or any(cond(content) for cond in self.filter_conds)):
             self._headings.append((token.level, content))
-        return rendered
+        return super().render_heading(token)
 
     @staticmethod
     def parse_rendered_heading(rendered):
         """
         Helper method; converts rendered heading to plain text.
+        No longer used by TocRenderer itself.
         """
         return re.sub(r'<.+?>', '', rendered)
 
 
+def _make_list(items):
+    token = object.__new__(block_token.List)
+    token.loose = False
+    token.start = None
+    token.line_number = None
+    token.children = [_make_list_item(content, subitems) for content, subitems in items]
+    return token
+
+
+def _make_list_item(content, subitems):
+    paragraph = object.__new__(block_token.Paragraph)
+    paragraph.children = [span_token.RawText(content)]
+    paragraph.line_number = None
+    token = object.__new__(block_token.ListItem)
+    token.loose = False
+    token.leader = '-'
+    token.indentation = 0
+    token.prepend = 2
+    token.line_number = None
+    token.children = [paragraph, _make_list(subitems)] if subitems else [paragraph]
+    return token
+
+
 TOCRenderer = TocRenderer
 """
 Deprecated name of the `TocRenderer` class.
@@ -1,7 +1,11 @@
+import re
 from itertools import chain
 from mistletoe import block_token, span_token
 from mistletoe.base_renderer import BaseRenderer, URI_SAFE_CHARACTERS
 
+# Note: It's probably better to leave potential XWiki macros as-is, i. e. don't escape their markers ('{{', '}}').
+_special_chars = re.compile(r'~|\[\[|\]\]|\*\*|//|##|--')
+
 
 class XWiki20Renderer(BaseRenderer):
     """
@@ -59,13 +63,7 @@ class XWiki20Renderer(BaseRenderer):
         return '~' + self.render_inner(token)
 
     def render_raw_text(self, token, escape=True):
-        return (token.content.replace('~', '~~')
-                # Note: It's probably better to leave potential XWiki macros as-is, i. e. don't escape their markers:
-                # .replace('{{', '~{{').replace('}}', '~}}')
-                .replace('[[', '~[[').replace(']]', '~]]')
-                .replace('**', '~**').replace('//', '~//')
-                .replace('##', '~##').replace('--', '~--')
-                ) if escape else token.content
+        return _special_chars.sub(_escape_special_chars, token.content) if escape else token.content
 
     def render_x_wiki_block_macro_start(self, token):
         return token.content + '\n'
@@ -124,7 +122,9 @@ class XWiki20Renderer(BaseRenderer):
         return template.format(attr=attr, inner=inner)
 
     def render_list(self, token):
+        self.listTokens.append('1' if token.start else '*')
         inner = self.render_inner(token)
+        del (self.listTokens[-1])
         return inner + self._block_eol(token)[0:-1]
 
     def render_list_item(self, token):
@@ -134,41 +134,24 @@ class XWiki20Renderer(BaseRenderer):
             prefix += '.'
 
         self.firstChildOfListItems.append(token.children[0])
-        inner = self.render_inner(token)
+        # Note: Nested list within a list item is OK, because it does its own wrapping if necessary.
+        wrap = any(not isinstance(child, block_token.List) for child in token.children[1:])
+        inner = self.render_inner_wrapped(token, wrap)
         del (self.firstChildOfListItems[-1])
 
         result = template.format(prefix=prefix, inner=inner.rstrip())
 
         return result
 
-    def render_inner(self, token):
-        if isinstance(token, block_token.List):
-            if token.start:
-                self.listTokens.append('1')
-            else:
-                self.listTokens.append('*')
-
+    def render_inner_wrapped(self, token, wrap):
+        """
+        Renders the children of a list item or a table cell, wrapping the ones
+        after the 1st child into a XWiki group if `wrap` is true.
+        """
         rendered = [self.render(child) for child in token.children]
-
-        wrap = False
-        if isinstance(token, block_token.BlockToken) and len(token.children) > 1:
-            # test what follows after the 1st child of this block token - wrap it to a XWiki block right after the 1st child if necessary
-            for child in token.children[1:]:
-                if isinstance(token, block_token.ListItem) and not isinstance(child, block_token.List):
-                    # Note: Nested list within a list item is OK, because it does its own wrapping if necessary.
-                    wrap = True
-                    break
-                if isinstance(token, (block_token.TableCell)) and isinstance(child, block_token.BlockToken):
-                    # Note: By-design, Markdown doesn't support multiple lines in one cell, but they can be enforced by using HTML.
-                    # See e. g. https://stackoverflow.com/questions/19950648/how-to-write-lists-inside-a-markdown-table.
-                    wrap = True
-                    break
-
-        if isinstance(token, block_token.List):
-            del (self.listTokens[-1])
-
-        return (''.join(rendered) if not wrap
-                else '{head}(((\n{tail}\n)))\n'.format(head=rendered[0].rstrip(), tail=''.join(rendered[1:]).rstrip()))
+        if not wrap:
+            return ''.join(rendered)
+        return '{head}(((\n{tail}\n)))\n'.format(head=rendered[0].rstrip(), tail=''.join(rendered[1:]).rstrip())
 
     def render_table(self, token):
         # Copied from JiraRenderer...
@@ -209,7 +192,10 @@ class XWiki20Renderer(BaseRenderer):
         else:
             template = '|{inner}'
 
-        inner = self.render_inner(token)
+        # Note: By-design, Markdown doesn't support multiple lines in one cell, but they can be enforced by using HTML.
+        # See e. g. https://stackoverflow.com/questions/19950648/how-to-write-lists-inside-a-markdown-table.
+        wrap = any(isinstance(child, block_token.BlockToken) for child in token.children[1:])
+        inner = self.render_inner_wrapped(token, wrap)
         return template.format(inner=inner)
 
     @staticmethod
@@ -229,6 +215,10 @@ class XWiki20Renderer(BaseRenderer):
                 or (len(self.lastChildOfQuotes) > 0 and token is self.lastChildOfQuotes[-1])) else '\n\n')
 
 
+def _escape_special_chars(match):
+    return '~' + match.group()
+
+
 def escape_url(raw):
     """
     Escape urls to prevent code injection craziness. (Hopefully.)
@@ -408,8 +408,8 @@ def follows(string, index, char):
 
 
 def shift_whitespace(string, index):
-    for i, c in enumerate(string[index:], start=index):
-        if c not in whitespace:
+    for i in range(index, len(string)):
+        if string[i] not in whitespace:
             return i
     return len(string)
 
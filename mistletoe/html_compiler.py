@@ -0,0 +1,334 @@
+"""
+Specialized rendering functions for HTML renderers.
+
+`compile_renderer` generates the source code of a rendering function for
+a given `HtmlRenderer` class, with the templates of the built-in render
+methods inlined, so that rendering needs no method dispatch, no `str.format`
+templates and no `_suppress_ptag_stack`. The output is the same as the
+output of `HtmlRenderer.render`. `HtmlRenderer.render_to` renders with
+these functions.
+
+Usage:
+    >>> from mistletoe import Document, HtmlRenderer
+    >>> from mistletoe.html_compiler import compile_renderer
+    >>> render = compile_renderer(HtmlRenderer)
+    >>> with HtmlRenderer() as renderer:
+    ...     rendered = render(renderer, Document(fin))
+"""
+
+import html
+import re
+import textwrap
+from mistletoe.html_renderer import HtmlRenderer
+from mistletoe.span_token import RawText
+
+
+__all__ = ['compile_renderer']
+
+
+# Source code of the write functions which replace the render methods of
+# HtmlRenderer. In these, `tight` takes the place of `_suppress_ptag_stack[-1]`,
+# and the lines `@inner token, tight` and `@joined tokens, tight` stand for
+# writing the children of `token`, and writing `tokens` separated by newlines.
+_WRITE_FUNCS = {
+    'render_strong': '''
+        append('<strong>')
+        @inner token, tight
+        append('</strong>')
+    ''',
+    'render_emphasis': '''
+        append('<em>')
+        @inner token, tight
+        append('</em>')
+    ''',
+    'render_inline_code': '''
+        append('<code>')
+        append(escape_text(token.children[0].content))
+        append('</code>')
+    ''',
+    'render_strikethrough': '''
+        append('<del>')
+        @inner token, tight
+        append('</del>')
+    ''',
+    'render_image': '''
+        append(renderer.render_image(token))
+    ''',
+    'render_link': '''
+        if sanitizer is not None and not sanitizer.is_safe_url(token.target):
+            @inner token, tight
+            return
+        if token.title:
+            append('<a href="' + escape_url(token.target) + '" title="' + escape(token.title) + '">')
+        else:
+            append('<a href="' + escape_url(token.target) + '">')
+        @inner token, tight
+        append('</a>')
+    ''',
+    'render_auto_link': '''
+        if sanitizer is not None and not sanitizer.is_safe_url(token.target):
+            @inner token, tight
+            return
+        if token.mailto:
+            append('<a href="' + escape_url('mailto:' + token.target) + '">')
+        else:
+            append('<a href="' + escape_url(token.target) + '">')
+        @inner token, tight
+        append('</a>')
+    ''',
+    'render_escape_sequence': '''
+        @inner token, tight
+    ''',
+    'render_raw_text': '''
+        append(escape_text(token.content))
+    ''',
+    'render_html_span': '''
+        append(token.content if sanitizer is None else sanitizer.sanitize(token.content))
+    ''',
+    'render_heading': '''
+        level = str(token.level)
+        if renderer.heading_ids:
+            append('<h' + level + renderer._heading_id_attr(token) + '>')
+        else:
+            append('<h' + level + '>')
+        @inner token, tight
+        append('</h' + level + '>')
+    ''',
+    'render_quote': '''
+        append('<blockquote>\\n')
+        @joined token.children, False
+        append('\\n</blockquote>' if token.children else '</blockquote>')
+    ''',
+    'render_paragraph': '''
+        if tight:
+            @inner token, tight
+        else:
+            append('<p>')
+            @inner token, tight
+            append('</p>')
+    ''',
+    'render_block_code': '''
+        if token.language:
+            append('<pre><code class="language-' + escape(token.language) + '">')
+        else:
+            append('<pre><code>')
+        append(escape_text(token.content))
+        append('</code></pre>')
+    ''',
+    'render_list': '''
+        if token.start is None:
+            append('<ul>\\n')
+            closing_tag = '\\n</ul>'
+        else:
+            append('<ol start="' + str(token.start) + '">\\n' if token.start != 1 else '<ol>\\n')
+            closing_tag = '\\n</ol>'
+        @joined token.children, not token.loose
+        append(closing_tag)
+    ''',
+    'render_list_item': '''
+        children = token.children
+        if not children:
+            append('<li></li>')
+            return
+        append('<li>' if tight and children[0].__class__.__name__ == 'Paragraph' else '<li>\\n')
+        @joined children, tight
+        append('</li>' if tight and children[-1].__class__.__name__ == 'Paragraph' else '\\n</li>')
+    ''',
+    'render_table': '''
+        append('<table>\\n')
+        if hasattr(token, 'header'):
+            append('<thead>\\n')
+            write_table_row(token.header, tight, is_header=True)
+            append('</thead>\\n')
+        append('<tbody>\\n')
+        @inner token, tight
+        append('</tbody>\\n</table>')
+    ''',
+    'render_table_row': '''
+        append('<tr>\\n')
+        for cell in token.children:
+            write_table_cell(cell, tight, is_header)
+        append('</tr>\\n')
+    ''',
+    'render_table_cell': '''
+        tag = 'th' if in_header else 'td'
+        if token.align is None:
+            align = 'left'
+        elif token.align == 0:
+            align = 'center'
+        elif token.align == 1:
+            align = 'right'
+        append('<' + tag + ' align="' + align + '">')
+        @inner token, tight
+        append('</' + tag + '>\\n')
+    ''',
+    'render_thematic_break': '''
+        append('<hr />')
+    ''',
+    'render_line_break': '''
+        append('\\n' if token.soft else '<br />\\n')
+    ''',
+    'render_html_block': '''
+        append(token.content if sanitizer is None else sanitizer.sanitize(token.content))
+    ''',
+    'render_document': '''
+        renderer.footnotes.update(token.footnotes)
+        renderer._heading_id_counts = {}
+        written = False
+        for i, child in enumerate(token.children):
+            if i:
+                append('\\n')
+            index = len(out)
+            (writers.get(child.__class__) or resolve(child.__class__))(child, tight)
+            written = written or i > 0 or any(out[index:])
+            if output is not None and len(out) >= flush_threshold:
+                output.write(''.join(out))
+                out.clear()
+        if written:
+            append('\\n')
+    ''',
+}
+
+_EXTRA_PARAMS = {
+    'render_table_row': ', is_header=False',
+    'render_table_cell': ', in_header=False',
+}
+
+_MACROS = {
+    'inner': '''
+        for child in {0}.children:
+            if child.__class__ is RawText:
+                append(escape_text(child.content))
+            else:
+                (writers.get(child.__class__) or resolve(child.__class__))(child, {1})
+    ''',
+    'joined': '''
+        for i, child in enumerate({0}):
+            if i:
+                append('\\n')
+            (writers.get(child.__class__) or resolve(child.__class__))(child, {1})
+    ''',
+}
+
+_macro_pattern = re.compile(r'^( *)@(\w+) (.+), (.+)$', re.MULTILINE)
+
+_RENDER_FUNC = '''
+def render(renderer, token, output):
+    out = []
+    append = out.append
+    flush_threshold = renderer.flush_threshold
+    escape = html.escape
+    escape_text = renderer.escape_html_text
+    escape_url = renderer.escape_url
+    sanitizer = renderer.sanitizer
+    writers = {{}}
+
+    def fallback(render_func):
+        def write(token, tight, *args, **kwargs):
+            renderer._suppress_ptag_stack.append(tight)
+            try:
+                append(render_func(token, *args, **kwargs))
+            finally:
+                renderer._suppress_ptag_stack.pop()
+        return write
+
+    def resolve(token_cls):
+        func_name = renderer_cls._resolve_render_func_name(token_cls)[1]
+        if func_name is None:
+            raise KeyError(token_cls.__name__)
+        write = compiled.get(func_name) or fallback(getattr(renderer, func_name))
+        writers[token_cls] = write
+        return write
+{write_funcs}
+    compiled = {compiled}
+    write_table_row = {write_table_row}
+    write_table_cell = {write_table_cell}
+    resolve(token.__class__)(token, renderer._suppress_ptag_stack[-1])
+    return ''.join(out)
+'''
+
+
+def compile_renderer(renderer_cls=HtmlRenderer):
+    """
+    Returns a function `render(renderer, token, output=None)`, which renders
+    `token` to the same string as `renderer.render(token)` would, where
+    `renderer` is an instance of `renderer_cls`, a subclass of HtmlRenderer.
+    If `output` (a file-like object) is given, the string is written to it
+    instead, in chunks as described by `HtmlRenderer.render_to`.
+
+    The built-in render methods of `renderer_cls` are inlined into the
+    function; the ones overridden by `renderer_cls` are called as usual.
+    The function is cached on `renderer_cls`, and generated anew when its
+    render methods are overridden after the fact. If `renderer` overrides
+    render methods by itself, or through its `render_map`, or if
+    `renderer_cls` overrides `render` or `render_inner`, then the function
+    simply returns `renderer.render(token)`.
+    """
+    own = tuple(name for name in _WRITE_FUNCS if _is_own(renderer_cls, name))
+    cache = renderer_cls.__dict__.get('_compiled_renders')
+    if cache is None:
+        cache = {}
+        setattr(renderer_cls, '_compiled_renders', cache)
+    if own not in cache:
+        if _is_own(renderer_cls, 'render') and _is_own(renderer_cls, 'render_inner'):
+            compiled_render = _compile(renderer_cls, own)
+        else:
+            compiled_render = _render_interpretively
+        cache.clear()
+        cache[own] = compiled_render
+    return cache[own]
+
+
+def _compile(renderer_cls, own):
+    write_funcs = []
+    for func_name in own:
+        body = _expand_macros(textwrap.dedent(_WRITE_FUNCS[func_name]))
+        write_funcs.append('def w_{}(token, tight{}):\n{}'.format(
+            func_name[len('render_'):], _EXTRA_PARAMS.get(func_name, ''), textwrap.indent(body, '    ')))
+
+    def write_func(func_name):
+        if func_name in own:
+            return 'w_' + func_name[len('render_'):]
+        return 'fallback(renderer.{})'.format(func_name)
+
+    source = _RENDER_FUNC.format(
+        write_funcs=textwrap.indent('\n' + '\n'.join(write_funcs), '    '),
+        compiled='{' + ', '.join('{!r}: {}'.format(name, write_func(name)) for name in own) + '}',
+        write_table_row=write_func('render_table_row'),
+        write_table_cell=write_func('render_table_cell'),
+    )
+    # raw text is written inline by `@inner`, unless its render method is overridden.
+    namespace = {'html': html, 'RawText': RawText if 'render_raw_text' in own else None, 'renderer_cls': renderer_cls}
+    exec(compile(source, '<compiled {}>'.format(renderer_cls.__name__), 'exec'), namespace)
+    render = namespace['render']
+
+    def compiled_render(renderer, token, output=None):
+        if _render_map_modified(renderer) or any(name.startswith('render') for name in vars(renderer)):
+            return _render_interpretively(renderer, token, output)
+        if output is None:
+            return render(renderer, token, None)
+        output.write(render(renderer, token, output))
+    compiled_render.source = source
+    return compiled_render
+
+
+def _render_map_modified(renderer):
+    # the render map of a renderer is only built when it is accessed.
+    return renderer._render_map is not None and renderer._render_map.modified
+
+
+def _render_interpretively(renderer, token, output=None):
+    if output is None:
+        return renderer.render(token)
+    output.write(renderer.render(token))
+
+
+def _expand_macros(source):
+    def expand(match):
+        indent, name, first, second = match.groups()
+        return textwrap.indent(textwrap.dedent(_MACROS[name]).format(first, second).strip('\n'), indent)
+    return _macro_pattern.sub(expand, source).strip('\n') + '\n'
+
+
+def _is_own(renderer_cls, func_name):
+    return getattr(renderer_cls, func_name) is getattr(HtmlRenderer, func_name)
@@ -3,14 +3,15 @@ HTML renderer for mistletoe.
 """
 
 import html
+import re
 from itertools import chain
-from urllib.parse import quote
 from mistletoe import block_token
 from mistletoe import span_token
 from mistletoe.block_token import HtmlBlock
 from mistletoe.span_token import HtmlSpan
 from mistletoe.base_renderer import BaseRenderer
-from mistletoe.base_renderer import URI_SAFE_CHARACTERS
+from mistletoe.base_renderer import quote_url
+from mistletoe.utils import plain_text
 
 
 class HtmlRenderer(BaseRenderer):
@@ -18,13 +19,22 @@ class HtmlRenderer(BaseRenderer):
     HTML renderer class.
 
     See mistletoe.base_renderer module for more info.
+
+    Attributes:
+        flush_threshold (int): the number of rendered pieces, after which
+            `render_to` writes out what it has got so far, between the
+            top-level blocks of a document.
     """
+    flush_threshold = 1024
+
     def __init__(
         self,
         *extras,
         html_escape_double_quotes=False,
         html_escape_single_quotes=False,
         process_html_tokens=True,
+        sanitizer=None,
+        heading_ids=False,
         **kwargs
     ):
         """
@@ -37,6 +47,14 @@ class HtmlRenderer(BaseRenderer):
             process_html_tokens (bool): whether to include HTML tokens in the
                 processing. If `False`, HTML markup will be treated as plain
                 text: e.g. input ``<br>`` will be rendered as ``&lt;br&gt;``.
+            sanitizer (HtmlSanitizer): if given, HTML tokens are filtered
+                through `sanitizer.sanitize()`, and links and images with
+                URLs rejected by `sanitizer.is_safe_url()` are rendered as
+                their plain content. See mistletoe.html_sanitizer.
+            heading_ids (bool): whether to add an `id` attribute to headings,
+                made from their text by `slugify()`, for linking to them.
+                The ids are made unique within each document by appending
+                "-1", "-2", etc. to repeated ones.
             **kwargs: additional parameters to be passed to the ancestor's
                 constructor.
         """
@@ -45,6 +63,9 @@ class HtmlRenderer(BaseRenderer):
         super().__init__(*final_extras, **kwargs)
         self.html_escape_double_quotes = html_escape_double_quotes
         self.html_escape_single_quotes = html_escape_single_quotes
+        self.sanitizer = sanitizer
+        self.heading_ids = heading_ids
+        self._heading_id_counts = {}
 
     def __exit__(self, *args):
         super().__exit__(*args)
@@ -73,6 +94,8 @@ class HtmlRenderer(BaseRenderer):
         return template.format(self.render_inner(token))
 
     def render_image(self, token: span_token.Image) -> str:
+        if self.sanitizer is not None and not self.sanitizer.is_safe_url(token.src):
+            return self.render_to_plain(token)
         template = '<img src="{}" alt="{}"{} />'
         src = self.escape_url(token.src)
         if token.title:
@@ -82,6 +105,8 @@ class HtmlRenderer(BaseRenderer):
         return template.format(src, self.render_to_plain(token), title)
 
     def render_link(self, token: span_token.Link) -> str:
+        if self.sanitizer is not None and not self.sanitizer.is_safe_url(token.target):
+            return self.render_inner(token)
         template = '<a href="{target}"{title}>{inner}</a>'
         target = self.escape_url(token.target)
         if token.title:
@@ -92,6 +117,8 @@ class HtmlRenderer(BaseRenderer):
         return template.format(target=target, title=title, inner=inner)
 
     def render_auto_link(self, token: span_token.AutoLink) -> str:
+        if self.sanitizer is not None and not self.sanitizer.is_safe_url(token.target):
+            return self.render_inner(token)
         template = '<a href="{target}">{inner}</a>'
         if token.mailto:
             target = self.escape_url('mailto:{}'.format(token.target))
@@ -106,14 +133,16 @@ class HtmlRenderer(BaseRenderer):
     def render_raw_text(self, token: span_token.RawText) -> str:
         return self.escape_html_text(token.content)
 
-    @staticmethod
-    def render_html_span(token: span_token.HtmlSpan) -> str:
+    def render_html_span(self, token: span_token.HtmlSpan) -> str:
+        if self.sanitizer is not None:
+            return self.sanitizer.sanitize(token.content)
         return token.content
 
     def render_heading(self, token: block_token.Heading) -> str:
-        template = '<h{level}>{inner}</h{level}>'
+        template = '<h{level}{attr}>{inner}</h{level}>'
+        attr = self._heading_id_attr(token) if self.heading_ids else ''
         inner = self.render_inner(token)
-        return template.format(level=token.level, inner=inner)
+        return template.format(level=token.level, attr=attr, inner=inner)
 
     def render_quote(self, token: block_token.Quote) -> str:
         elements = ['<blockquote>']
@@ -206,15 +235,34 @@ class HtmlRenderer(BaseRenderer):
     def render_line_break(token: span_token.LineBreak) -> str:
         return '\n' if token.soft else '<br />\n'
 
-    @staticmethod
-    def render_html_block(token: block_token.HtmlBlock) -> str:
+    def render_html_block(self, token: block_token.HtmlBlock) -> str:
+        if self.sanitizer is not None:
+            return self.sanitizer.sanitize(token.content)
         return token.content
 
     def render_document(self, token: block_token.Document) -> str:
         self.footnotes.update(token.footnotes)
+        self._heading_id_counts = {}
         inner = '\n'.join([self.render(child) for child in token.children])
         return '{}\n'.format(inner) if inner else ''
 
+    def render_to(self, token, output):
+        """
+        Renders the token and writes the result to `output`, a file-like object.
+
+        Rendering is done by the function generated for this class by
+        mistletoe.html_compiler, which appends the rendered pieces of the tree
+        to a single list, rather than rendering nested tokens into strings
+        of their own. The list is joined and written out after every top-level
+        block of a document which makes it longer than `flush_threshold`, and
+        at the end. Thus the memory used is bounded by the size of the largest
+        block, and `output` can process the output while the rest is being
+        rendered, e.g. compress it (see mistletoe.sinks). The output is the same
+        as from `render`.
+        """
+        from mistletoe.html_compiler import compile_renderer
+        compile_renderer(type(self))(self, token, output)
+
     def escape_html_text(self, s: str) -> str:
         """
         Like `html.escape()`, but this  looks into the current rendering options
@@ -223,21 +271,55 @@ class HtmlRenderer(BaseRenderer):
         Intended for escaping text content. To escape content of an attribute,
         simply call `html.escape()`.
         """
-        s = s.replace("&", "&amp;")  # Must be done first!
-        s = s.replace("<", "&lt;")
-        s = s.replace(">", "&gt;")
-        if self.html_escape_double_quotes:
+        if '&' in s:
+            s = s.replace("&", "&amp;")  # Must be done first!
+        if '<' in s:
+            s = s.replace("<", "&lt;")
+        if '>' in s:
+            s = s.replace(">", "&gt;")
+        if self.html_escape_double_quotes and '"' in s:
             s = s.replace('"', "&quot;")
-        if self.html_escape_single_quotes:
+        if self.html_escape_single_quotes and '\'' in s:
             s = s.replace('\'', "&#x27;")
         return s
 
+    def _heading_id_attr(self, token) -> str:
+        """
+        Returns the `id` attribute for the heading `token`, unique within
+        the current document; or nothing, if its text gives an empty id.
+        """
+        slug = self.slugify(plain_text(token))
+        if not slug:
+            return ''
+        # maps each id given so far to the next number to try for it as a prefix,
+        # so that repeated headings take constant time.
+        counts = self._heading_id_counts
+        number = counts.get(slug, 0)
+        heading_id = '{}-{}'.format(slug, number) if number else slug
+        while heading_id in counts:
+            number += 1
+            heading_id = '{}-{}'.format(slug, number)
+        counts[slug] = number + 1
+        counts.setdefault(heading_id, 1)
+        return ' id="{}"'.format(heading_id)
+
+    @staticmethod
+    def slugify(text: str) -> str:
+        """
+        Converts the text of a heading into an id: lowercases it, drops
+        punctuation and replaces spaces with hyphens (like GitHub does).
+        """
+        return _slug_ignored.sub('', text.strip().lower()).replace(' ', '-')
+
     @staticmethod
     def escape_url(raw: str) -> str:
         """
         Escape urls to prevent code injection craziness. (Hopefully.)
         """
-        return html.escape(quote(raw, safe=URI_SAFE_CHARACTERS))
+        return html.escape(quote_url(raw))
+
+
+_slug_ignored = re.compile(r'[^\w\- ]')
 
 
 HTMLRenderer = HtmlRenderer
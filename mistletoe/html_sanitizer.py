@@ -0,0 +1,130 @@
+"""
+Allowlist-based filtering of raw HTML, for the sanitizing mode of HtmlRenderer.
+"""
+
+import html
+import re
+from mistletoe.span_token import _tag, _attrs
+
+
+__all__ = ['HtmlSanitizer']
+
+
+_markup = re.compile(r'''
+    <(?P<open_name>{tag})(?P<attrs>{attrs})\s*(?P<self_closing>/?)>
+    | </(?P<closing_name>{tag})\s*>
+    | <(?:!--.*?--|\?.*?\?|!\[CDATA\[.*?\]\]|![A-Za-z][^>]*)>  # comment, instruction, CDATA, declaration
+    | <  # a stray angle bracket
+'''.format(tag=_tag, attrs=_attrs), re.VERBOSE | re.DOTALL)
+
+_attribute = re.compile(r'''\s+([A-Za-z_:][A-Za-z0-9_.:-]*)(?:\s*=\s*([^\s"'=<>`]+|'[^']*'|"[^"]*"))?''')
+
+_url_scheme = re.compile(r'([A-Za-z][A-Za-z0-9+.-]*):')
+
+# browsers ignore these characters in URLs, e.g. in 'java\tscript:'.
+_ignored_in_urls = re.compile(r'[\x00-\x20\x7f]+')
+
+
+class HtmlSanitizer:
+    """
+    Filters raw HTML against allowlists of tags, attributes and URL schemes.
+
+    Tags which are not allowed are removed (their content is kept as text),
+    as are comments, processing instructions, declarations and CDATA sections.
+    Attributes which are not allowed for a tag, and URLs with schemes which are
+    not allowed, are removed from the allowed tags. Angle brackets which do not
+    start a tag are escaped.
+
+    Attributes:
+        tags (set): names of the allowed tags, in lower case.
+        attributes (dict): maps tag names to sets of their allowed attributes.
+                           The attributes for the tag name '*' are allowed
+                           for all tags.
+        url_schemes (set): allowed URL schemes, in lower case. URLs without
+                           a scheme (relative URLs) are always allowed.
+        url_attributes (set): attributes whose values are URLs.
+    """
+    default_tags = frozenset({
+        'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'cite', 'code', 'dd', 'del',
+        'details', 'div', 'dl', 'dt', 'em', 'figcaption', 'figure', 'h1', 'h2', 'h3',
+        'h4', 'h5', 'h6', 'hr', 'i', 'img', 'ins', 'kbd', 'li', 'mark', 'ol', 'p',
+        'pre', 'q', 's', 'samp', 'small', 'span', 'strong', 'sub', 'summary', 'sup',
+        'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul', 'var',
+    })
+    default_attributes = {
+        '*': frozenset({'title', 'lang', 'dir'}),
+        'a': frozenset({'href', 'name'}),
+        'abbr': frozenset(),
+        'blockquote': frozenset({'cite'}),
+        'img': frozenset({'src', 'alt', 'width', 'height'}),
+        'ol': frozenset({'start', 'type'}),
+        'td': frozenset({'align', 'colspan', 'rowspan'}),
+        'th': frozenset({'align', 'colspan', 'rowspan'}),
+    }
+    default_url_schemes = frozenset({'http', 'https', 'mailto'})
+    url_attributes = frozenset({'href', 'src', 'cite'})
+
+    def __init__(self, tags=None, attributes=None, url_schemes=None):
+        """
+        Args:
+            tags (iterable): names of the allowed tags, or None for `default_tags`.
+            attributes (dict): maps tag names to iterables of their allowed
+                               attributes, or None for `default_attributes`.
+            url_schemes (iterable): allowed URL schemes, or None for
+                                    `default_url_schemes`.
+        """
+        self.tags = {tag.lower() for tag in (self.default_tags if tags is None else tags)}
+        attributes = self.default_attributes if attributes is None else attributes
+        self.attributes = {tag.lower(): {name.lower() for name in names}
+                           for tag, names in attributes.items()}
+        schemes = self.default_url_schemes if url_schemes is None else url_schemes
+        self.url_schemes = {scheme.lower() for scheme in schemes}
+
+    def sanitize(self, content: str) -> str:
+        """
+        Returns the raw HTML `content` without the markup which is not allowed.
+        """
+        if '<' not in content:
+            return content
+        return _markup.sub(self._sanitize_markup, content)
+
+    def is_safe_url(self, url: str) -> bool:
+        """
+        Tells whether `url` is relative or has one of the allowed schemes.
+        """
+        match = _url_scheme.match(_ignored_in_urls.sub('', url))
+        return match is None or match.group(1).lower() in self.url_schemes
+
+    def _sanitize_markup(self, match):
+        name = match.group('open_name')
+        if name is not None:
+            return self._sanitize_open_tag(name.lower(), match.group('attrs'), match.group('self_closing'))
+        name = match.group('closing_name')
+        if name is not None:
+            name = name.lower()
+            return '</{}>'.format(name) if name in self.tags else ''
+        if match.group() == '<':
+            return '&lt;'
+        return ''
+
+    def _sanitize_open_tag(self, name, attrs, self_closing):
+        if name not in self.tags:
+            return ''
+        allowed = self.attributes.get(name, set()) | self.attributes.get('*', set())
+        parts = ['<', name]
+        for attr_match in _attribute.finditer(attrs):
+            attr_name, value = attr_match.groups()
+            attr_name = attr_name.lower()
+            if attr_name not in allowed:
+                continue
+            if value is None:
+                parts.append(' ' + attr_name)
+                continue
+            if value[0] in '"\'':
+                value = value[1:-1]
+            value = html.unescape(value)
+            if attr_name in self.url_attributes and not self.is_safe_url(value):
+                continue
+            parts.append(' {}="{}"'.format(attr_name, html.escape(value)))
+        parts.append(' />' if self_closing else '>')
+        return ''.join(parts)
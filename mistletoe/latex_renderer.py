@@ -2,11 +2,13 @@
 LaTeX renderer for mistletoe.
 """
 
+import codecs
 import string
+import tempfile
 from itertools import chain
-from urllib.parse import quote
 import mistletoe.latex_token as latex_token
-from mistletoe.base_renderer import BaseRenderer, URI_SAFE_CHARACTERS
+from mistletoe import block_token
+from mistletoe.base_renderer import BaseRenderer, quote_url
 
 # (customizable) delimiters for inline code
 verb_delimiters = string.punctuation + string.digits
@@ -15,8 +17,24 @@ for delimiter in '*':  # remove invalid delimiters
 for delimiter in reversed('|!"\'=+'):  # start with most common delimiters
     verb_delimiters = delimiter + verb_delimiters.replace(delimiter, '')
 
+# special characters in text, and their escaped forms
+_escapes = (
+    ('$', '\\$'), ('#', '\\#'), ('{', '\\{'), ('}', '\\}'),
+    ('&', '\\&'), ('_', '\\_'), ('%', '\\%'), ('^', '\\^{}'),
+)
+
 
 class LaTeXRenderer(BaseRenderer):
+    """
+    LaTeX renderer class.
+
+    Attributes:
+        spool_size (int): the size of the rendered body of a document (in bytes of
+            UTF-8) up to which `render_to` keeps it in memory, rather than
+            in a temporary file.
+    """
+    spool_size = 1 << 20
+
     def __init__(self, *extras, **kwargs):
         """
         Args:
@@ -39,11 +57,9 @@ class LaTeXRenderer(BaseRenderer):
         content = self.render_raw_text(token.children[0], escape=False)
 
         # search for delimiter not present in content
-        for delimiter in self.verb_delimiters:
-            if delimiter not in content:
-                break
-
-        if delimiter in content:  # no delimiter found
+        used = set(content)
+        delimiter = next((d for d in self.verb_delimiters if d not in used), None)
+        if delimiter is None:
             raise RuntimeError('Unable to find delimiter for verb macro')
 
         template = '\\verb{delimiter}{content}{delimiter}'
@@ -78,11 +94,17 @@ class LaTeXRenderer(BaseRenderer):
         return self.render_inner(token)
 
     def render_raw_text(self, token, escape=True):
-        return (token.content.replace('$', '\\$').replace('#', '\\#')
-                             .replace('{', '\\{').replace('}', '\\}')
-                             .replace('&', '\\&').replace('_', '\\_')
-                             .replace('%', '\\%').replace('^', '\\^{}')
-               ) if escape else token.content
+        return self.escape_latex(token.content) if escape else token.content
+
+    @staticmethod
+    def escape_latex(s: str) -> str:
+        """
+        Escapes the characters of `s` which are special in LaTeX text.
+        """
+        for char, escaped in _escapes:
+            if char in s:
+                s = s.replace(char, escaped)
+        return s
 
     def render_heading(self, token):
         inner = self.render_inner(token)
@@ -169,15 +191,47 @@ class LaTeXRenderer(BaseRenderer):
         return ''.join(pattern.format(options=options or '', package=package)
                          for package, options in self.packages.items())
 
-    def render_document(self, token):
+    def render_preamble(self):
         template = ('\\documentclass{{article}}\n'
                     '{packages}'
-                    '\\begin{{document}}\n'
-                    '{inner}'
-                    '\\end{{document}}\n')
+                    '\\begin{{document}}\n')
+        return template.format(packages=self.render_packages())
+
+    def render_document(self, token):
+        self.footnotes.update(token.footnotes)
+        inner = self.render_inner(token)
+        return self.render_preamble() + inner + '\\end{document}\n'
+
+    def render_to(self, token, output):
+        """
+        Renders the token and writes the result to `output`, a file-like object.
+
+        The preamble of a document lists the packages it needs, which are only
+        known once all of it has been rendered: the body is thus rendered one
+        top-level block at a time into a temporary file (kept in memory up to
+        `spool_size` bytes of UTF-8), which is copied to `output` after the preamble.
+        The output is the same as from `render`, with the memory used bounded
+        by the size of the largest block.
+        """
+        cls = type(self)
+        if (not isinstance(token, block_token.Document)
+                or cls.render is not LaTeXRenderer.render
+                or cls.render_document is not LaTeXRenderer.render_document):
+            output.write(self.render(token))
+            return
         self.footnotes.update(token.footnotes)
-        return template.format(inner=self.render_inner(token),
-                               packages=self.render_packages())
+        # the body is encoded by hand, as the text mode of SpooledTemporaryFile
+        # only takes an `errors` argument since Python 3.8.
+        with tempfile.SpooledTemporaryFile(self.spool_size) as body:
+            for child in token.children:
+                body.write(self.render(child).encode('utf-8', 'surrogatepass'))
+            output.write(self.render_preamble())
+            body.seek(0)
+            decoder = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+            for chunk in iter(lambda: body.read(1 << 16), b''):
+                output.write(decoder.decode(chunk))
+            output.write(decoder.decode(b'', final=True))
+        output.write('\\end{document}\n')
 
     @staticmethod
     def escape_url(raw: str) -> str:
@@ -190,6 +244,6 @@ class LaTeXRenderer(BaseRenderer):
         regardless of whether these characters are escaped, and the result
         remains the same (at least for pdflatex from TeX Live 2019).
         """
-        quoted_url = quote(raw, safe=URI_SAFE_CHARACTERS)
+        quoted_url = quote_url(raw)
         return quoted_url.replace('%', '\\%') \
                          .replace('#', '\\#')
@@ -88,6 +88,13 @@ class MarkdownRenderer(BaseRenderer):
     except for nonessential whitespace. Except when rendering with word wrapping enabled.
 
     Includes `HtmlBlock` and `HtmlSpan` tokens in the parsing.
+
+    If a document keeps its source lines (`Document(lines, keep_source=True)`),
+    its top-level blocks which were parsed from that source and not modified
+    after parsing (see `Token.mark_modified`) are copied verbatim from the
+    source, which is much faster than rendering them, and keeps their
+    formatting exactly. This is not done when word wrapping or normalizing
+    whitespace.
     """
 
     _whitespace = re.compile(r"\s+")
@@ -134,7 +141,7 @@ class MarkdownRenderer(BaseRenderer):
         Renders the tree of tokens rooted at the given token into markdown.
         """
         if isinstance(token, block_token.BlockToken):
-            lines = self.render_map[token.__class__.__name__](
+            lines = self.get_render_func(token.__class__)(
                 token, max_line_length=self.max_line_length
             )
         else:
@@ -256,7 +263,10 @@ class MarkdownRenderer(BaseRenderer):
     def render_document(
         self, token: block_token.Document, max_line_length: Optional[int]
     ) -> Iterable[str]:
-        return self.blocks_to_lines(token.children, max_line_length=max_line_length)
+        source_lines = getattr(token, "source_lines", None)
+        if source_lines is None or max_line_length or self.normalize_whitespace:
+            return self.blocks_to_lines(token.children, max_line_length=max_line_length)
+        return self.blocks_to_lines_verbatim(token.children, source_lines, token.source_id)
 
     def render_heading(
         self, token: block_token.Heading, max_line_length: Optional[int]
@@ -390,10 +400,27 @@ class MarkdownRenderer(BaseRenderer):
         Renders a sequence of block tokens into a sequence of lines.
         """
         for token in tokens:  # noqa: F402
-            yield from self.render_map[token.__class__.__name__](
+            yield from self.get_render_func(token.__class__)(
                 token, max_line_length=max_line_length
             )
 
+    def blocks_to_lines_verbatim(
+        self, tokens: Iterable[block_token.BlockToken], source_lines: Sequence[str], source_id: str
+    ) -> Iterable[str]:
+        """
+        Renders a sequence of top-level block tokens into a sequence of lines,
+        taking the lines of the unmodified tokens parsed from `source_lines`
+        (the tokens with the given `source_id`) from them.
+        """
+        for token in tokens:  # noqa: F402
+            if token.modified or getattr(token, "source_id", None) != source_id:
+                yield from self.get_render_func(token.__class__)(
+                    token, max_line_length=None
+                )
+            else:
+                for line in source_lines[token.line_number - 1:token.end_line_number]:
+                    yield line[:-1]
+
     def span_to_lines(
         self, tokens: Iterable[span_token.SpanToken], max_line_length: Optional[int]
     ) -> Iterable[str]:
@@ -420,7 +447,7 @@ class MarkdownRenderer(BaseRenderer):
             ):
                 yield Fragment("\n", hard_line_break=True)
             else:
-                yield from self.render_map[token.__class__.__name__](token)
+                yield from self.get_render_func(token.__class__)(token)
 
 
     @classmethod
@@ -432,43 +459,50 @@ class MarkdownRenderer(BaseRenderer):
         With word wrapping, if a `max_line_length` is given, or else following the
         original text flow as closely as possible.
         """
-        current_line = ""
+        # the words (or text fragments) of the current line, joined when it is done.
+        current_line = []
         if not max_line_length:
             # plain rendering: merge all fragments and split on newlines
             for fragment in fragments:
                 if "\n" in fragment.text:
                     lines = fragment.text.split("\n")
-                    yield current_line + lines[0]
-                    for inner_line in lines[1:-1]:
-                        yield inner_line
-                    current_line = lines[-1]
+                    current_line.append(lines[0])
+                    yield "".join(current_line)
+                    yield from lines[1:-1]
+                    current_line = [lines[-1]]
                 else:
-                    current_line += fragment.text
+                    current_line.append(fragment.text)
+            last_line = "".join(current_line)
+            if last_line:
+                yield last_line
         else:
             # render with word wrapping
+            length = 0
             for word in cls.make_words(fragments):
                 if word == "\n":
                     # hard line break
-                    yield current_line
-                    current_line = ""
+                    yield " ".join(current_line)
+                    current_line = []
+                    length = 0
                     continue
 
-                if not current_line:
+                if not length:
                     # first word on an empty line: accept and continue
-                    current_line = word
+                    current_line = [word]
+                    length = len(word)
                     continue
 
                 # try to fit the word on the current line.
                 # if it doesn't fit, flush the line and start on the next
-                test = current_line + " " + word
-                if len(test) <= max_line_length:
-                    current_line = test
+                if length + 1 + len(word) <= max_line_length:
+                    current_line.append(word)
+                    length += 1 + len(word)
                 else:
-                    yield current_line
-                    current_line = word
-
-        if current_line:
-            yield current_line
+                    yield " ".join(current_line)
+                    current_line = [word]
+                    length = len(word)
+            if length:
+                yield " ".join(current_line)
 
     @classmethod
     def make_words(cls, fragments: Iterable[Fragment]) -> Iterable[str]:
@@ -477,24 +511,35 @@ class MarkdownRenderer(BaseRenderer):
         which do not contain breakable spaces or line breaks. The exception is
         hard line breaks, which are represented by the string `\n`.
         """
-        word = ""
+        # the parts of the current word, as concatenating strings is
+        # quadratic on words glued from many fragments.
+        parts = []
         for fragment in fragments:
             if getattr(fragment, "wordwrap", False):
-                first = True
-                for item in cls._whitespace.split(fragment.text):
-                    if first:
-                        word += item
-                        first = False
-                    else:
-                        if word:
-                            yield word
-                        word = item
+                items = cls._whitespace.split(fragment.text)
+                if len(items) == 1:
+                    parts.append(items[0])
+                    continue
+                if parts:
+                    parts.append(items[0])
+                    word = "".join(parts)
+                    parts.clear()
+                else:
+                    word = items[0]
+                if word:
+                    yield word
+                if len(items) > 2:
+                    yield from filter(None, items[1:-1])
+                if items[-1]:
+                    parts.append(items[-1])
             elif getattr(fragment, "hard_line_break", False):
-                yield from (word + fragment.text[:-1], "\n")
-                word = ""
+                parts.append(fragment.text[:-1])
+                yield from ("".join(parts), "\n")
+                parts.clear()
             else:
-                word += fragment.text
+                parts.append(fragment.text)
 
+        word = "".join(parts)
         if word:
             yield word
 
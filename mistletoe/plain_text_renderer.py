@@ -0,0 +1,125 @@
+"""
+Plain text renderer for mistletoe.
+"""
+
+import html
+import re
+from itertools import chain
+from mistletoe import block_token, span_token
+from mistletoe.base_renderer import BaseRenderer
+
+
+class PlainTextRenderer(BaseRenderer):
+    """
+    Renders only the text content of documents, e.g. for full-text search
+    indexing: no markup, and no escaping.
+
+    Blocks are separated by newlines, as are list items and table rows.
+    Table cells are separated by tabs. Raw HTML tags are dropped,
+    only the text of HTML blocks is kept, except for the contents of
+    `<script>` and `<style>` elements.
+    """
+    # tags, and script and style elements with their contents (up to the end
+    # of the block, if they are not closed in it).
+    _html_tag = re.compile(r'<(script|style)\b.*?(?:</\1\s*>|\Z)|<[^>]*>', re.IGNORECASE | re.DOTALL)
+
+    def __init__(
+        self,
+        *extras,
+        include_code_blocks=True,
+        include_link_targets=False,
+        include_image_alt=True,
+        **kwargs
+    ):
+        """
+        Args:
+            extras (list): allows subclasses to add even more custom tokens.
+            include_code_blocks (bool): whether to include the content
+                of code blocks.
+            include_link_targets (bool): whether to include the target of each
+                link, in parentheses after the link text.
+            include_image_alt (bool): whether to include the alt text of images.
+            **kwargs: additional parameters to be passed to the ancestor's
+                constructor.
+        """
+        super().__init__(*chain((block_token.HtmlBlock, span_token.HtmlSpan), extras), **kwargs)
+        self.include_code_blocks = include_code_blocks
+        self.include_link_targets = include_link_targets
+        self.include_image_alt = include_image_alt
+
+    def render_to(self, token, output):
+        """
+        Renders the token and writes the result to `output`, a file-like object.
+
+        A document is written one top-level block at a time, so that indexers
+        can consume the text as it is rendered.
+        """
+        if not isinstance(token, block_token.Document):
+            output.write(self.render(token))
+            return
+        self.footnotes.update(token.footnotes)
+        for text in self._render_blocks(token.children):
+            output.write(text)
+            output.write('\n')
+
+    def _render_blocks(self, tokens):
+        """
+        Renders block tokens, skipping the ones without any text.
+        """
+        for token in tokens:
+            text = self.render(token)
+            if text:
+                yield text
+
+    def _join_blocks(self, tokens, separator='\n'):
+        return separator.join(self._render_blocks(tokens))
+
+    def render_inline_code(self, token: span_token.InlineCode) -> str:
+        return token.children[0].content
+
+    def render_image(self, token: span_token.Image) -> str:
+        return self.render_inner(token) if self.include_image_alt else ''
+
+    def render_link(self, token: span_token.Link) -> str:
+        if self.include_link_targets:
+            return '{} ({})'.format(self.render_inner(token), token.target)
+        return self.render_inner(token)
+
+    def render_line_break(self, token: span_token.LineBreak) -> str:
+        return '\n'
+
+    @staticmethod
+    def render_html_span(token: span_token.HtmlSpan) -> str:
+        return ''
+
+    def render_html_block(self, token: block_token.HtmlBlock) -> str:
+        return html.unescape(self._html_tag.sub('', token.content)).strip('\n')
+
+    def render_quote(self, token: block_token.Quote) -> str:
+        return self._join_blocks(token.children)
+
+    def render_block_code(self, token: block_token.BlockCode) -> str:
+        return token.content.rstrip('\n') if self.include_code_blocks else ''
+
+    def render_list(self, token: block_token.List) -> str:
+        return self._join_blocks(token.children)
+
+    def render_list_item(self, token: block_token.ListItem) -> str:
+        return self._join_blocks(token.children)
+
+    def render_table(self, token: block_token.Table) -> str:
+        rows = [token.header] if hasattr(token, 'header') else []
+        rows.extend(token.children)
+        return self._join_blocks(rows)
+
+    def render_table_row(self, token: block_token.TableRow) -> str:
+        return '\t'.join([self.render(cell) for cell in token.children])
+
+    @staticmethod
+    def render_thematic_break(token: block_token.ThematicBreak) -> str:
+        return ''
+
+    def render_document(self, token: block_token.Document) -> str:
+        self.footnotes.update(token.footnotes)
+        text = self._join_blocks(token.children)
+        return text + '\n' if text else ''
@@ -0,0 +1,99 @@
+"""
+Output sinks for the `render_to` method of renderers.
+
+`HtmlRenderer.render_to` writes its output in chunks as it renders,
+so a sink which processes each chunk as it comes keeps memory bounded,
+e.g. when compressing the output:
+
+    >>> from mistletoe import Document, HtmlRenderer
+    >>> from mistletoe.sinks import render_to_files
+    >>> with HtmlRenderer() as renderer:
+    ...     render_to_files(renderer, Document(fin), 'foo.html', 'foo.html.gz')
+"""
+
+import codecs
+import zlib
+from contextlib import ExitStack
+
+
+__all__ = ['CompressingWriter', 'TeeWriter', 'render_to_files']
+
+
+class CompressingWriter:
+    """
+    A text sink which encodes and compresses the text written to it, and
+    writes the compressed data to a binary file-like object as soon as
+    the compressor produces it.
+
+    Closing the writer (also done on leaving its `with` block) finishes the
+    compressed stream, but does not close the underlying file object.
+    """
+    _wbits = {
+        'gzip': 16 + zlib.MAX_WBITS,
+        'zlib': zlib.MAX_WBITS,
+        'deflate': -zlib.MAX_WBITS,
+    }
+
+    def __init__(self, fileobj, format='gzip', level=9, encoding='utf-8'):
+        """
+        Args:
+            fileobj: a binary file-like object to write the compressed data to.
+            format (str): the container of the compressed data: 'gzip' (as
+                          written by the gzip module, but without a file name
+                          and time stamp), 'zlib', or 'deflate' (raw data).
+            level (int): the compression level, from 0 to 9.
+            encoding (str): the encoding of the text.
+        """
+        if format not in self._wbits:
+            raise ValueError('Unknown compression format: {!r}.'.format(format))
+        self.fileobj = fileobj
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, self._wbits[format])
+        self._encoder = codecs.getincrementalencoder(encoding)()
+        self.closed = False
+
+    def write(self, text: str) -> int:
+        data = self._compressor.compress(self._encoder.encode(text))
+        if data:
+            self.fileobj.write(data)
+        return len(text)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.fileobj.write(self._compressor.compress(self._encoder.encode('', final=True)))
+            self.fileobj.write(self._compressor.flush())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TeeWriter:
+    """
+    A text sink which writes the text written to it to several file-like objects.
+    """
+    def __init__(self, *outputs):
+        self.outputs = outputs
+
+    def write(self, text: str) -> int:
+        for output in self.outputs:
+            output.write(text)
+        return len(text)
+
+
+def render_to_files(renderer, token, path=None, gzip_path=None, encoding='utf-8'):
+    """
+    Renders `token` with `renderer`, writing the output to the file `path`,
+    and compressed with gzip to the file `gzip_path`, at the same time.
+    Either of the paths can be None, to skip that file.
+    """
+    with ExitStack() as stack:
+        outputs = []
+        if path is not None:
+            outputs.append(stack.enter_context(open(path, 'w', encoding=encoding, newline='')))
+        if gzip_path is not None:
+            fileobj = stack.enter_context(open(gzip_path, 'wb'))
+            outputs.append(stack.enter_context(CompressingWriter(fileobj, encoding=encoding)))
+        renderer.render_to(token, outputs[0] if len(outputs) == 1 else TeeWriter(*outputs))
@@ -72,6 +72,28 @@ class Token:
         output += " at {:#x}>".format(id(self))
         return output
 
+    @property
+    def modified(self) -> bool:
+        """
+        Returns whether this token (or any of its descendants) has been
+        modified after parsing, see `mark_modified`.
+        """
+        return getattr(self, '_modified', False)
+
+    def mark_modified(self):
+        """
+        Marks this token and its ancestors as modified after parsing.
+
+        Renderers which reproduce the source of unmodified tokens (see
+        `MarkdownRenderer`) then render them anew. Setting the ``children``
+        of a token does this automatically; call it after changing any other
+        attribute of a token, or its list of children in place.
+        """
+        token = self
+        while token is not None and not token.modified:
+            token._modified = True
+            token = token.parent
+
     @property
     def parent(self) -> Optional['Token']:
         """Returns the parent token, if there is any."""
@@ -90,8 +112,11 @@ class Token:
         """"
         Sets new child (nested) tokens.
         Passed tokens are iterated and their ``parent`` property is set to
-        this token.
+        this token. Replacing the children after parsing marks this token
+        as modified.
         """
+        if _root_node is None and hasattr(self, '_children'):
+            self.mark_modified()
         self._children = value
         if value:
             for child in value:
@@ -1,4 +1,5 @@
 from collections import namedtuple
+from mistletoe.span_token import RawText
 
 TraverseResult = namedtuple('TraverseResult', ['node', 'parent', 'depth'])
 
@@ -31,3 +32,17 @@ def traverse(source, klass=None, depth=None, include_source=False):
                 [(child, c) for c in child.children or []]
             )
         next_children = new_children
+
+
+def plain_text(token):
+    """Returns the text of a token: the content of its RawText descendants.
+
+    Markup, including raw HTML, is left out.
+
+    Args:
+
+        token: The token whose text is returned
+    """
+    if token.children is None:
+        return token.content if isinstance(token, RawText) else ''
+    return ''.join([plain_text(child) for child in token.children])
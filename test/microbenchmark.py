@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of individual parts of mistletoe, on generated input.
+
+Usage: python -m test.microbenchmark [name ...]
+"""
+
+import glob
+import io
+import sys
+from time import perf_counter
+
+from mistletoe import Document, HtmlRenderer, ast_serializer
+from mistletoe.contrib.jira_renderer import JiraRenderer
+from mistletoe.contrib.xwiki20_renderer import XWiki20Renderer
+from mistletoe.markdown_renderer import MarkdownRenderer
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def timed(label, func, *args):
+    start = perf_counter()
+    func(*args)
+    print('{:<40} {:.4f}'.format(label, perf_counter() - start))
+
+
+@benchmark('footnotes')
+def run_footnotes():
+    template = '[label {0}]: http://example.com/{0} "title {0}"\n'
+    for count in (1000, 10000, 100000):
+        source = 'Some [text][label 1].\n\n' + ''.join(template.format(i) for i in range(count))
+        timed('{} definitions'.format(count), Document, source)
+
+
+@benchmark('html-nesting')
+def run_html_nesting():
+    depth = 60
+    quotes = ''.join('> ' * level + 'quoted *text* {}\n'.format(level) for level in range(1, depth))
+    lists = ''.join('  ' * level + '- item **{}**\n'.format(level) for level in range(depth))
+    for name, source in (('nested quotes', quotes * 20), ('nested lists', lists * 20)):
+        with HtmlRenderer() as renderer:
+            document = Document(source)
+            timed(name + ': render', renderer.render, document)
+            timed(name + ': render_to', renderer.render_to, document, io.StringIO())
+
+
+@benchmark('html-escaping')
+def run_html_escaping():
+    plain = 'Plain text without any characters to escape, which is the common case.'
+    special = 'Some "quoted" text, it\'s AT&T and a < b.'
+    source = ''.join('{} {}\n\n'.format(plain, special if i % 10 == 0 else plain) for i in range(20000))
+    document = Document(source)
+    contents = [child.content for paragraph in document.children for child in paragraph.children
+                if hasattr(child, 'content')]
+    for quotes in (False, True):
+        with HtmlRenderer(html_escape_double_quotes=quotes, html_escape_single_quotes=quotes) as renderer:
+            label = 'quotes' if quotes else 'no quotes'
+            timed(label + ': escape_html_text', lambda: [renderer.escape_html_text(s) for s in contents])
+            timed(label + ': render', renderer.render, document)
+
+
+@benchmark('markdown-wrapping')
+def run_markdown_wrapping():
+    # a long paragraph, and a long "word" made of many fragments
+    words = ' '.join('word *{0}* `{0}`'.format(i) for i in range(20000))
+    glued = ''.join('word*{}*'.format(i) for i in range(20000))
+    for name, source in (('long paragraph', words), ('long word', glued)):
+        with MarkdownRenderer() as renderer:
+            document = Document(source)
+            for max_line_length in (None, 80):
+                renderer.max_line_length = max_line_length
+                timed('{}: max_line_length={}'.format(name, max_line_length), renderer.render, document)
+
+
+@benchmark('wiki-renderers')
+def run_wiki_renderers():
+    sources = []
+    for path in sorted(glob.glob('test/samples/*.md')):
+        with open(path, 'r', encoding='utf-8') as fin:
+            sources.append(fin.read())
+    for renderer_cls in (JiraRenderer, XWiki20Renderer):
+        with renderer_cls() as renderer:
+            documents = [Document(source) for source in sources] * 50
+            timed(renderer_cls.__name__, lambda: [renderer.render(document) for document in documents])
+
+
+@benchmark('binary-ast')
+def run_binary_ast():
+    with open('test/samples/syntax.md', 'r', encoding='utf-8') as fin:
+        source = fin.read() * 20
+    with HtmlRenderer():
+        document = Document(source)
+        data = ast_serializer.dumps(document)
+        print('{:<40} {}'.format('source size', len(source.encode('utf-8'))))
+        print('{:<40} {}'.format('serialized size', len(data)))
+        timed('parse', Document, source)
+        timed('dumps', ast_serializer.dumps, document)
+        timed('loads', ast_serializer.loads, data)
+
+
+@benchmark('renderer-construction')
+def run_renderer_construction():
+    def construct(renderer_cls, count):
+        for _ in range(count):
+            with renderer_cls():
+                pass
+
+    for renderer_cls in (HtmlRenderer, MarkdownRenderer):
+        timed('20000 x ' + renderer_cls.__name__, construct, renderer_cls, 20000)
+
+
+def main(*names):
+    for name in names or BENCHMARKS:
+        print(name)
+        print('=' * len(name))
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
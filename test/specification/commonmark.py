@@ -2,6 +2,7 @@ import re
 import sys
 import json
 from mistletoe import Document, HtmlRenderer
+from mistletoe.html_compiler import compile_renderer
 from traceback import print_tb
 from argparse import ArgumentParser
 
@@ -13,12 +14,12 @@ Examples (their numbers) from the specification which are known to fail in mistl
 
 
 def run_tests(test_entries, start=None, end=None,
-              quiet=False, verbose=False, known=False):
+              quiet=False, verbose=False, known=False, compiled=False):
     if known:
         print('ignoring tests:', ', '.join(map(str, KNOWN)) + '\n')
     start = start or 0
     end = end or sys.maxsize
-    results = [run_test(test_entry, quiet) for test_entry in test_entries
+    results = [run_test(test_entry, quiet, compiled) for test_entry in test_entries
             if test_entry['example'] >= start and test_entry['example'] <= end
             and (not known or test_entry['example'] not in KNOWN)]
     if verbose:
@@ -32,11 +33,14 @@ def run_tests(test_entries, start=None, end=None,
     return not fails
 
 
-def run_test(test_entry, quiet=False):
+def run_test(test_entry, quiet=False, compiled=False):
     test_case = test_entry['markdown'].splitlines(keepends=True)
     try:
         with HtmlRenderer(html_escape_double_quotes=True) as renderer:
-            output = renderer.render(Document(test_case))
+            if compiled:
+                output = compile_renderer(HtmlRenderer)(renderer, Document(test_case))
+            else:
+                output = renderer.render(Document(test_case))
         success = test_entry['html'] == output
         if not success and not quiet:
             print_test_entry(test_entry, output)
@@ -130,6 +134,8 @@ def main():
                         help="Specify alternative specfile to run.")
     parser.add_argument('-n', '--ignore-known', dest='known', action='store_true',
                         help="Ignore tests entries that are known to fail.")
+    parser.add_argument('-c', '--compiled', dest='compiled', action='store_true',
+                        help="Render with the function generated by html_compiler.")
     args = parser.parse_args()
 
     start = args.start
@@ -138,10 +144,11 @@ def main():
     quiet = args.quiet
     tests = args.tests
     known = args.known
+    compiled = args.compiled
     if args.section is not None:
         start, end = locate_section(args.section, tests)
 
-    if not run_tests(tests, start, end, quiet, verbose, known):
+    if not run_tests(tests, start, end, quiet, verbose, known, compiled):
         sys.exit(1)
 
 
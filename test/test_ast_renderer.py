@@ -1,5 +1,9 @@
+import io
+import json
+import sys
 import unittest
-from mistletoe import Document, ast_renderer
+from mistletoe import Document, ast_renderer, block_token
+from parameterized import parameterized
 
 
 class TestAstRenderer(unittest.TestCase):
@@ -127,3 +131,48 @@ class TestAstRenderer(unittest.TestCase):
         }
         output = ast_renderer.get_ast(d)
         self.assertEqual(output, expected)
+
+
+class TestAstRendererOutput(unittest.TestCase):
+    lines = [
+        '# heading 1\n',
+        '\n',
+        '| A | B |\n',
+        '| - | - |\n',
+        '| 1 | 2 |\n',
+        '\n',
+        '[foo]: bar "title"\n',
+    ]
+
+    @parameterized.expand([(2,), (None,), (0,)])
+    def test_render(self, indent):
+        with ast_renderer.AstRenderer(indent=indent) as renderer:
+            d = Document(self.lines)
+            separators = (',', ': ' if indent is not None else ':')
+            expected = json.dumps(ast_renderer.get_ast(d), indent=indent, separators=separators) + '\n'
+            self.assertEqual(renderer.render(d), expected)
+            renderer.flush_threshold = 4
+            output = io.StringIO()
+            renderer.render_to(d, output)
+            self.assertEqual(output.getvalue(), expected)
+
+    def test_ndjson(self):
+        with ast_renderer.AstRenderer(ndjson=True) as renderer:
+            d = Document(self.lines)
+            lines = renderer.render(d).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0]), {'type': 'Document', 'footnotes': {'foo': ['bar', 'title']}, 'line_number': 1})
+        self.assertEqual([json.loads(line)['type'] for line in lines[1:]], ['Heading', 'Table'])
+
+    def test_deep_nesting(self):
+        d = Document([])
+        token = d
+        for _ in range(sys.getrecursionlimit()):
+            quote = object.__new__(block_token.Quote)
+            quote.line_number = None
+            token.children = [quote]
+            token = quote
+        token.children = []
+        with ast_renderer.AstRenderer(indent=None) as renderer:
+            output = renderer.render(d)
+        self.assertTrue(output.endswith('"children":[]}' + ']}' * sys.getrecursionlimit() + '\n'))
@@ -0,0 +1,97 @@
+import io
+import sys
+import unittest
+from mistletoe import Document, HtmlRenderer, ast_serializer, block_token, span_token
+from mistletoe.ast_renderer import get_ast
+from parameterized import parameterized
+
+
+class TestAstSerializer(unittest.TestCase):
+    @parameterized.expand([
+        ('basic_blocks.md',),
+        ('jquery.md',),
+        ('lists.md',),
+        ('quotes.md',),
+        ('syntax.md',),
+    ])
+    def test_round_trip(self, filename):
+        with HtmlRenderer() as renderer:
+            with open('test/samples/' + filename, 'r', encoding='utf-8') as fin:
+                document = Document(fin)
+            loaded = ast_serializer.loads(ast_serializer.dumps(document))
+            self.assertEqual(get_ast(loaded), get_ast(document))
+            self.assertEqual(renderer.render(loaded), renderer.render(document))
+
+    def test_tree_structure(self):
+        document = Document(['| a | b |\n', '| - | - |\n', '| *c* | [d] |\n', '\n', '[d]: /url "title"\n'])
+        loaded = ast_serializer.loads(ast_serializer.dumps(document))
+        self.assertIsInstance(loaded, block_token.Document)
+        self.assertIsNone(loaded.parent)
+        self.assertEqual(loaded.footnotes, {'d': ('/url', 'title')})
+        table = loaded.children[0]
+        self.assertIsInstance(table, block_token.Table)
+        self.assertIs(table.parent, loaded)
+        self.assertIsInstance(table.header, block_token.TableRow)
+        self.assertEqual(table.column_align, [None, None])
+        cell = table.children[0].children[0]
+        self.assertIsInstance(cell.children[0], span_token.Emphasis)
+        self.assertIs(cell.children[0].parent, cell)
+        link = table.children[0].children[1].children[0]
+        self.assertEqual((link.target, link.title), ('/url', 'title'))
+
+    def test_unicode(self):
+        document = Document(['# héading \U0001f600\n', '\n', 'wörld\n'])
+        loaded = ast_serializer.loads(ast_serializer.dumps(document))
+        self.assertEqual(get_ast(loaded), get_ast(document))
+
+    def test_integers(self):
+        document = Document(['hello\n'])
+        values = [0, 1, -1, 2 ** 31, -2 ** 31 - 1, 2 ** 40, -2 ** 70]
+        document.children[0].values = values
+        loaded = ast_serializer.loads(ast_serializer.dumps(document))
+        self.assertEqual(loaded.children[0].values, values)
+
+    def test_file_objects(self):
+        document = Document(['*hello*\n'])
+        buffer = io.BytesIO()
+        ast_serializer.dump(document, buffer)
+        buffer.seek(0)
+        self.assertEqual(get_ast(ast_serializer.load(buffer)), get_ast(document))
+
+    @parameterized.expand([
+        (b'',),
+        (b'not a tree at all',),
+    ])
+    def test_invalid_data(self, data):
+        with self.assertRaises(ValueError):
+            ast_serializer.loads(data)
+
+    def test_truncated_data(self):
+        data = ast_serializer.dumps(Document(['hello\n']))
+        with self.assertRaises(ValueError):
+            ast_serializer.loads(data[:-1])
+
+    def test_non_token_class(self):
+        data = ast_serializer.dumps(Document(['hello\n']))
+        forged = data.replace(b'mistletoe.block_token:Document', b'mistletoe.block_token:tokenize')
+        with self.assertRaises(ValueError):
+            ast_serializer.loads(forged)
+
+    def test_module_not_imported(self):
+        data = ast_serializer.dumps(Document(['hello\n']))
+        forged = data.replace(b'mistletoe.block_token:Document', b'mistletoe.not_a_module:Document')
+        with self.assertRaises(ValueError):
+            ast_serializer.loads(forged)
+        self.assertNotIn('mistletoe.not_a_module', sys.modules)
+
+    def test_unsupported_attribute(self):
+        document = Document(['hello\n'])
+        document.children[0].extra = object()
+        with self.assertRaises(TypeError):
+            ast_serializer.dumps(document)
+
+    def test_shared_token(self):
+        document = Document(['hello\n'])
+        document.children[0].children.append(document.children[0].children[0])
+        with self.assertRaises(ValueError):
+            ast_serializer.dumps(document)
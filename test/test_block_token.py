@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+from functools import partial
 from unittest.mock import call, patch
 
 from parameterized import parameterized
@@ -497,6 +500,22 @@ class TestFootnote(unittest.TestCase):
         self.assertEqual(token.footnotes, {"key 1": ("value1", "title1"),
                                            "key 2": ("value2", "title2")})
 
+    def test_parse_simple_and_complex_definitions(self):
+        lines = ['[key 1]: <value 1> \'title1\'\n',
+                 '[key\\] 2]: value(2) "title\\"2"\n',
+                 '[key 3]: value3 (title3)\n',
+                 '[key 4]: value4\n',
+                 '  (title\n',
+                 '4)\n',
+                 'paragraph\n']
+        self.assertIsNone(block_token.Footnote.match_simple_reference(lines[1], 0))
+        token = block_token.Document(lines)
+        self.assertEqual(token.footnotes, {"key 1": ("value 1", "title1"),
+                                           "key\\] 2": ("value(2)", 'title"2'),
+                                           "key 3": ("value3", "title3"),
+                                           "key 4": ("value4", "title\n4")})
+        self.assertIsInstance(token.children[0], block_token.Paragraph)
+
     def test_parse_with_space_in_every_part(self):
         lines = ['[Foo bar]:\n',
                  '<my url>\n',
@@ -596,6 +615,75 @@ class TestDocument(unittest.TestCase):
         self.assertIsInstance(document.children[0], block_token.Paragraph)
         self.assertEqual(len(document.children), 1)
 
+    @parameterized.expand([
+        ('crlf_string', '# heading\r\n\r\nsome\r\nlines\r\n'),
+        ('cr_string', '# heading\r\rsome\rlines'),
+        ('crlf_lines', ['# heading\r\n', '\r\n', 'some\r\n', 'lines\r\n']),
+        ('cr_inside_line', ['# heading\r\rsome\r', 'lines']),
+    ])
+    def test_line_endings(self, _, lines):
+        document = block_token.Document(lines)
+        heading, paragraph = document.children
+        self.assertEqual(heading.children[0].content, 'heading')
+        self.assertEqual(paragraph.line_number, 3)
+        self.assertEqual([child.content for child in paragraph.children], ['some', '', 'lines'])
+
+    def test_from_bytes(self):
+        data = '\ufeff# heading\r\n\r\nsöme\nlines\n'.encode('utf-8')
+        with patch('mistletoe.block_tokenizer.decode_lines',
+                   side_effect=partial(block_tokenizer.decode_lines, chunk_size=3)):
+            document = block_token.Document.from_bytes(data)
+        heading, paragraph = document.children
+        self.assertEqual(heading.children[0].content, 'heading')
+        self.assertEqual(paragraph.children[0].content, 'söme')
+
+    def test_from_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'doc.md')
+            with open(path, 'wb') as fout:
+                fout.write('# heading\n\nsöme\nlines'.encode('utf-8'))
+            document = block_token.Document.from_path(path)
+            self.assertEqual(len(document.children), 2)
+            self.assertEqual(document.children[1].children[-1].content, 'lines')
+
+            with open(path, 'wb'):
+                pass
+            self.assertEqual(block_token.Document.from_path(path).children, [])
+
+    def test_from_path_line_boundaries(self):
+        from mistletoe import HtmlRenderer
+        text = 'para one\x0cstill para\r\n\n    code\x0c\r    more\n'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'doc.md')
+            with open(path, 'w', encoding='utf-8', newline='') as fout:
+                fout.write(text)
+            with HtmlRenderer() as renderer, open(path, 'r', encoding='utf-8') as fin:
+                expected = renderer.render(block_token.Document(fin))
+                self.assertEqual(renderer.render(block_token.Document.from_path(path)), expected)
+                self.assertIn('<p>para one\x0cstill para</p>', expected)
+
+    @patch.object(block_token.Document, 'inline_chunk_size', 16)
+    def test_parallel_inline_parsing(self):
+        from mistletoe import HtmlRenderer
+        lines = ['# *heading*\n',
+                 '\n',
+                 '> a [link][key] and <b>html</b>\n',
+                 '\n',
+                 '- item **one**\n',
+                 '- item `two`\n',
+                 '\n',
+                 '| a | b |\n',
+                 '| - | - |\n',
+                 '| *c* | d |\n',
+                 '\n',
+                 '[key]: http://example.com\n']
+        with HtmlRenderer() as renderer:
+            expected = renderer.render(block_token.Document(lines))
+            document = block_token.Document(lines, workers=2)
+            self.assertEqual(renderer.render(document), expected)
+        heading = document.children[0]
+        self.assertIs(heading.children[0].parent, heading)
+
 
 class TestThematicBreak(unittest.TestCase):
     def test_match(self):
@@ -646,6 +734,22 @@ class TestHtmlBlock(unittest.TestCase):
         self.assertEqual(1, len(tokens))
         self.assertIsInstance(tokens[0], block_token.HtmlBlock)
 
+    @parameterized.expand([
+        ('<script type="x">\n', (1, '</script>')),
+        ('  <!-- comment\n', (2, '-->')),
+        ('<?php\n', (3, '?>')),
+        ('<!DOCTYPE html>\n', (4, '>')),
+        ('<![CDATA[\n', (5, ']]>')),
+        ('<DIV class="x">\n', (6, None)),
+        ('</td>\n', (6, None)),
+        ('<custom-tag a="b">\n', (7, None)),
+        ('<custom-tag> text\n', None),
+        ('    <div>\n', None),
+        ('some text\n', None),
+    ])
+    def test_classify(self, line, expected):
+        self.assertEqual(block_token.HtmlBlock.classify(line), expected)
+
 
 class TestLeafBlockTokenContentProperty(unittest.TestCase):
     def setUp(self):
@@ -1,6 +1,7 @@
-from unittest import TestCase
-from unittest.mock import call, patch, sentinel, mock_open, Mock
-from mistletoe import cli
+import os
+from unittest import TestCase, skipUnless
+from unittest.mock import call, patch, sentinel, MagicMock, Mock
+from mistletoe import HtmlRenderer, cli
 
 
 class TestCli(TestCase):
@@ -34,23 +35,37 @@ class TestCli(TestCase):
         calls = [call(filename, sentinel.RendererCls) for filename in filenames]
         mock_convert_file.assert_has_calls(calls)
 
-    @patch('mistletoe.markdown', return_value='rendered text')
+    @patch('mistletoe.Document.from_path', return_value=sentinel.Document)
     @patch('sys.stdout.buffer.write')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_convert_file_success(self, mock_open_, mock_write, mock_markdown):
+    def test_convert_file_success(self, mock_write, mock_from_path):
         filename = 'foo'
-        cli.convert_file(filename, sentinel.RendererCls)
-        mock_open_.assert_called_with(filename, 'r', encoding='utf-8')
+        renderer = MagicMock()
+        renderer.return_value.__enter__.return_value.render.return_value = 'rendered text'
+        cli.convert_file(filename, renderer)
+        mock_from_path.assert_called_with(filename)
+        renderer.return_value.__enter__.return_value.render.assert_called_with(sentinel.Document)
         mock_write.assert_called_with('rendered text'.encode())
 
     @patch('builtins.open', side_effect=OSError)
     @patch('sys.exit')
     def test_convert_file_fail(self, mock_exit, mock_open_):
         filename = 'foo'
-        cli.convert_file(filename, sentinel.RendererCls)
-        mock_open_.assert_called_with(filename, 'r', encoding='utf-8')
+        cli.convert_file(filename, MagicMock())
+        mock_open_.assert_called_with(filename, 'rb')
         mock_exit.assert_called_with('Cannot open file "foo".')
 
+    @skipUnless(os.path.isdir('/dev/fd'), 'needs /dev/fd')
+    @patch('sys.stdout')
+    def test_convert_file_from_pipe(self, mock_stdout):
+        read_fd, write_fd = os.pipe()
+        try:
+            os.write(write_fd, b'# hi\n')
+            os.close(write_fd)
+            cli.convert_file('/dev/fd/{}'.format(read_fd), HtmlRenderer)
+        finally:
+            os.close(read_fd)
+        mock_stdout.buffer.write.assert_called_with(b'<h1>hi</h1>\n')
+
     @patch('mistletoe.cli._import_readline')
     @patch('mistletoe.cli._print_heading')
     @patch('mistletoe.markdown', return_value='rendered text')
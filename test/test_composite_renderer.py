@@ -0,0 +1,35 @@
+import io
+from functools import partial
+from unittest import TestCase
+from mistletoe import Document, block_token, span_token
+from mistletoe.ast_renderer import AstRenderer
+from mistletoe.composite_renderer import CompositeRenderer
+from mistletoe.html_renderer import HtmlRenderer
+from mistletoe.contrib.toc_renderer import TocRenderer
+
+
+class TestCompositeRenderer(TestCase):
+    lines = ['# Title\n', '\n', '## Section *one*\n', '\n', '<div>\n', 'html\n', '</div>\n']
+
+    def _render(self, renderer_cls, token=None):
+        with renderer_cls() as renderer:
+            return renderer.render(token or Document(self.lines))
+
+    def test_render(self):
+        with CompositeRenderer(HtmlRenderer, AstRenderer, partial(TocRenderer, depth=3)) as renderer:
+            self.assertEqual(len(block_token._token_types), len(set(block_token._token_types)))
+            self.assertEqual(len(span_token._token_types), len(set(span_token._token_types)))
+            token = Document(self.lines)
+            html, ast, toc_html = renderer.render(token)
+            self.assertEqual(len(renderer.renderers[2].toc.children), 1)
+        self.assertEqual(html, self._render(HtmlRenderer))
+        self.assertEqual(toc_html, html)
+        self.assertEqual(ast, self._render(AstRenderer, token))
+        self.assertIn('"HtmlBlock"', ast)
+
+    def test_render_to(self):
+        outputs = [io.StringIO(), io.StringIO()]
+        with CompositeRenderer(HtmlRenderer, partial(HtmlRenderer, html_escape_double_quotes=True)) as renderer:
+            renderer.render_to(Document(self.lines), outputs)
+            self.assertRaises(ValueError, renderer.render_to, Document(self.lines), outputs[:1])
+        self.assertEqual([output.getvalue() for output in outputs], [self._render(HtmlRenderer)] * 2)
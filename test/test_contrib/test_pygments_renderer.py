@@ -1,8 +1,12 @@
 import unittest
+from concurrent.futures import Executor, Future
+from unittest import mock
 
 from mistletoe import Document
 from mistletoe.contrib.pygments_renderer import PygmentsRenderer
 from parameterized import parameterized
+from pygments.formatters.html import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
 from pygments.util import ClassNotFound
 
 
@@ -44,3 +48,82 @@ class TestPygmentsRenderer(unittest.TestCase):
         token = Document(['```foobar\n', 'unknown language\n', '```\n'])
         with self.assertRaises(ClassNotFound):
             renderer.render(token)
+
+    def test_fallback_lexer(self):
+        renderer = PygmentsRenderer(fallback_lexer='python')
+        token = Document(['```foobar\n', '# comment\n', '```\n'])
+        self.assertIn('<span style="color: #3D7B7B; font-style: italic"># comment</span>', renderer.render(token))
+
+    def test_highlight_cache(self):
+        token = Document(['```python\n', '# cached\n', '```\n'])
+        expected = PygmentsRenderer().render(token)
+        info = PygmentsRenderer.highlight_cache_info()
+        with mock.patch('mistletoe.contrib.pygments_renderer.highlight') as highlight:
+            self.assertEqual(PygmentsRenderer().render(token), expected)
+            highlight.assert_not_called()
+        self.assertEqual(PygmentsRenderer.highlight_cache_info().hits, info.hits + 1)
+        self.assertEqual(PygmentsRenderer.highlight_cache_info().misses, info.misses)
+
+    def test_parallel_highlighting(self):
+        lines = ['```python\n', '# in workers\n', '```\n', '\n', '- ```\n', '  in workers\n', '  ```\n']
+        with PygmentsRenderer(fallback_lexer='text', workers=2) as renderer:
+            output = renderer.render(Document(lines))
+            self.assertEqual(len(renderer._highlighted), 2)
+        with PygmentsRenderer(fallback_lexer='text') as renderer:
+            self.assertEqual(output, renderer.render(Document(lines)))
+            self.assertEqual(renderer._highlighted, {})
+
+    def test_parallel_highlighting_with_executor(self):
+        class InlineExecutor(Executor):
+            def submit(self, fn, *args, **kwargs):
+                future = Future()
+                future.set_result(fn(*args, **kwargs))
+                return future
+
+        lines = ['```python\n', '# executor\n', '```\n', '\n', '```\n', 'executor\n', '```\n']
+        with PygmentsRenderer(fallback_lexer='text', workers=InlineExecutor()) as renderer:
+            output = renderer.render(Document(lines))
+            self.assertEqual(len(renderer._highlighted), 2)
+        with PygmentsRenderer(fallback_lexer='text') as renderer:
+            self.assertEqual(output, renderer.render(Document(lines)))
+
+    def test_css_classes(self):
+        token = Document(['```python\n', '# python language\n', '```\n'])
+        with PygmentsRenderer(inline_styles=False) as renderer:
+            output = renderer.render(token)
+            style_defs = renderer.get_style_defs()
+        self.assertEqual(output, '<div class="highlight"><pre><span></span><span class="c1"># python language</span>\n'
+                                 '</pre></div>\n\n')
+        self.assertIn('.highlight .c1 { color: #3D7B7B; font-style: italic }', style_defs)
+        self.assertIn('style="', PygmentsRenderer().render(token))
+
+    def test_styles_per_instance(self):
+        token = Document(['```python\n', '# python language\n', '```\n'])
+        default, monokai = PygmentsRenderer(), PygmentsRenderer(style='monokai')
+        self.assertNotEqual(default.render(token), monokai.render(token))
+        self.assertNotEqual(default.get_style_defs(), monokai.get_style_defs())
+
+    def test_highlight_cache_options(self):
+        token = Document(['```python\n', '# python language\n', '```\n'])
+        default = PygmentsRenderer().render(token)
+        renderer = PygmentsRenderer()
+        renderer.formatter = HtmlFormatter(linenos='table', noclasses=True)
+        self.assertIn('linenos', renderer.render(token))
+        self.assertNotIn('linenos', default)
+
+        unknown = Document(['```foobar\n', '  unknown language\n', '```\n'])
+        stripped = PygmentsRenderer(fallback_lexer=get_lexer_by_name('text', stripall=True))
+        self.assertNotEqual(PygmentsRenderer(fallback_lexer='text').render(unknown), stripped.render(unknown))
+
+    def test_highlight_cache_formatter_attributes(self):
+        token = Document(['```python\n', '# python language\n', '```\n'])
+        inline = PygmentsRenderer().render(token)
+        self.assertIn('style=', inline)
+        renderer = PygmentsRenderer()
+        renderer.formatter.noclasses = False
+        with_classes = renderer.render(token)
+        self.assertNotIn('style=', with_classes)
+        self.assertIn('class="c1"', with_classes)
+        renderer.formatter.cssclass = 'code'
+        self.assertIn('class="code"', renderer.render(token))
+        self.assertEqual(PygmentsRenderer().render(token), inline)
@@ -58,3 +58,23 @@ class TestTocRenderer(TestCase):
         heading_item = toc.children[0].children[1].children[1].children[1].children[0]
         self.assertIsInstance(heading_item, block_token.ListItem)
         self.assertEqual(heading_item.children[0].children[0].content, 'subsubheading 1')
+
+    def test_render_toc(self):
+        with TocRenderer(omit_title=False) as renderer:
+            renderer.render(Document(['# A & *B*\n', '### skipped level\n', '## C\n', '# D\n']))
+            output = renderer.render(renderer.toc)
+        expected = ('<ul>\n<li>A &amp; B\n'
+                    '<ul>\n<li>skipped level</li>\n<li>C</li>\n</ul>\n</li>\n'
+                    '<li>D</li>\n</ul>')
+        self.assertEqual(output, expected)
+
+    def test_toc_parents(self):
+        renderer = TocRenderer(omit_title=False)
+        renderer._headings = [(1, 'heading'), (2, 'subheading')]
+        toc = renderer.toc
+        item = toc.children[0]
+        self.assertIs(item.parent, toc)
+        self.assertIs(item.children[0].parent, item)
+        self.assertIs(item.children[0].children[0].parent, item.children[0])
+        self.assertIs(item.children[1].parent, item)
+        self.assertIs(item.children[1].children[0].parent, item.children[1])
@@ -0,0 +1,76 @@
+import io
+from unittest import TestCase
+from mistletoe import Document, span_token
+from mistletoe.html_compiler import compile_renderer
+from mistletoe.html_renderer import HtmlRenderer
+from parameterized import parameterized
+
+
+class TestCompileRenderer(TestCase):
+    def _render_all(self, renderer_cls, lines, **kwargs):
+        """
+        Returns the output of `render`, and checks that the compiled function
+        and `render_to` give the same.
+        """
+        with renderer_cls(**kwargs) as renderer:
+            token = Document(lines)
+            expected = renderer.render(token)
+            self.assertEqual(compile_renderer(renderer_cls)(renderer, token), expected)
+            output = io.StringIO()
+            renderer.render_to(token, output)
+            self.assertEqual(output.getvalue(), expected)
+            return expected
+
+    @parameterized.expand([('syntax.md',), ('jquery.md',), ('lists.md',), ('quotes.md',)])
+    def test_same_output_as_render(self, filename):
+        with open('test/samples/{}'.format(filename), 'r', encoding='utf-8') as fin:
+            self._render_all(HtmlRenderer, fin.readlines(), html_escape_single_quotes=True, heading_ids=True)
+
+    def test_overridden_render_methods(self):
+        class CustomRenderer(HtmlRenderer):
+            def render_raw_text(self, token):
+                return token.content.upper()
+
+            def render_paragraph(self, token):
+                return '<div>{}</div>'.format(self.render_inner(token))
+
+            def render_table_cell(self, token, in_header=False):
+                return '<td>{}</td>'.format(self.render_inner(token))
+
+        lines = ['- *foo*\n', '\n', '  bar\n', '- baz\n', '\n', '| a | *b* |\n', '| - | --- |\n', '| c | d |\n']
+        output = self._render_all(CustomRenderer, lines)
+        self.assertIn('<div><em>FOO</em></div>', output)
+        self.assertIn('<td><em>B</em></td>', output)
+
+    def test_overridden_render_inner(self):
+        class CustomRenderer(HtmlRenderer):
+            def render_inner(self, token):
+                return super().render_inner(token).upper()
+
+        self.assertEqual(self._render_all(CustomRenderer, ['*foo*\n']), '<p><EM>FOO</EM></p>\n')
+
+    def test_render_map_entry(self):
+        with HtmlRenderer() as renderer:
+            renderer.render_map['Strong'] = lambda token: '<b>{}</b>'.format(renderer.render_inner(token))
+            output = io.StringIO()
+            renderer.render_to(Document(['**foo**\n']), output)
+            self.assertEqual(output.getvalue(), '<p><b>foo</b></p>\n')
+
+    def test_token_subclass(self):
+        class Shout(span_token.Strong):
+            pass
+
+        token = Shout.__new__(Shout)
+        token.children = [span_token.RawText('foo')]
+        with HtmlRenderer() as renderer:
+            self.assertEqual(compile_renderer(HtmlRenderer)(renderer, token), '<strong>foo</strong>')
+
+    def test_cache(self):
+        class CustomRenderer(HtmlRenderer):
+            pass
+
+        render = compile_renderer(CustomRenderer)
+        self.assertIs(compile_renderer(CustomRenderer), render)
+        CustomRenderer.render_strong = lambda self, token: '<b>{}</b>'.format(self.render_inner(token))
+        self.assertIsNot(compile_renderer(CustomRenderer), render)
+        self.assertEqual(self._render_all(CustomRenderer, ['**foo**\n']), '<p><b>foo</b></p>\n')
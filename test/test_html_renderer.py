@@ -1,5 +1,8 @@
+import io
+from urllib.parse import quote
 from unittest import TestCase, mock
-from mistletoe import Document
+from mistletoe import Document, span_token
+from mistletoe.base_renderer import URI_SAFE_CHARACTERS, quote_url
 from mistletoe.html_renderer import HtmlRenderer
 from parameterized import parameterized
 
@@ -169,6 +172,22 @@ class TestHtmlRendererEscaping(TestCase):
         expected = '<p><a href="mailto:a&amp;b@example.com">a&amp;b@example.com</a></p>\n'
         self.assertEqual(output, expected)
 
+    @parameterized.expand([
+        ('http://example.com/a_b.c~d?e=f&g=h#i',),
+        ('http://example.com/with space/"quotes"',),
+        ('http://example.com/\u00fcber',),
+        ('<script>',),
+    ])
+    def test_quote_url(self, url):
+        self.assertEqual(quote_url(url), quote(url, safe=URI_SAFE_CHARACTERS))
+
+    def test_escape_url_memoized(self):
+        with HtmlRenderer() as renderer:
+            output = renderer.render(Document(['[a](<x y>) [b](<x y>) <http://z>\n']))
+            self.assertEqual(output, '<p><a href="x%20y">a</a> <a href="x%20y">b</a> <a href="http://z">http://z</a></p>\n')
+            cache_info = renderer.escape_url.cache_info()
+            self.assertEqual((cache_info.hits, cache_info.misses), (1, 2))
+
 
 class TestHtmlRendererFootnotes(TestCase):
     def setUp(self):
@@ -185,3 +204,68 @@ class TestHtmlRendererFootnotes(TestCase):
         token = Document(['[name][foo]\n', '\n', '[foo]: target\n'])
         expected = '<p><a href="target">name</a></p>\n'
         self.assertEqual(self.renderer.render(token), expected)
+
+
+class TestHtmlRendererDispatch(TestCase):
+    def test_token_subclass(self):
+        class Shout(span_token.Strong):
+            pass
+
+        with HtmlRenderer() as renderer:
+            token = Shout.__new__(Shout)
+            token.children = [span_token.RawText('foo')]
+            self.assertEqual(renderer.render(token), '<strong>foo</strong>')
+            self.assertEqual(HtmlRenderer._render_func_names[Shout], (span_token.Strong, 'render_strong'))
+
+    def test_render_map_entry(self):
+        with HtmlRenderer() as renderer:
+            self.assertEqual(renderer.render_map['Strong'], renderer.render_strong)
+            token = Document(['**foo**\n'])
+            self.assertEqual(renderer.render(token), '<p><strong>foo</strong></p>\n')
+            renderer.render_map['Strong'] = lambda token: '<b>{}</b>'.format(renderer.render_inner(token))
+            self.assertEqual(renderer.render(token), '<p><b>foo</b></p>\n')
+
+    def test_render_map_contents(self):
+        with HtmlRenderer() as renderer:
+            self.assertEqual(len(renderer.render_map), 25)
+            self.assertEqual(renderer.render_map.copy()['HtmlSpan'], renderer.render_html_span)
+            self.assertIn(('Strong', renderer.render_strong), renderer.render_map.items())
+
+    def test_render_map_changes(self):
+        with HtmlRenderer() as renderer:
+            token = Document(['**foo**\n'])
+            self.assertEqual(renderer.render(token), '<p><strong>foo</strong></p>\n')
+            renderer.render_map.pop('Strong')
+            renderer.render_map.setdefault('Strong', lambda token: '<b>{}</b>'.format(renderer.render_inner(token)))
+            self.assertEqual(renderer.render(token), '<p><b>foo</b></p>\n')
+            renderer.render_map.clear()
+            self.assertEqual(renderer.render(token), '<p><strong>foo</strong></p>\n')
+
+    def test_no_render_func(self):
+        class Unknown(span_token.SpanToken):
+            pass
+
+        with HtmlRenderer() as renderer:
+            self.assertRaises(KeyError, renderer.render, Unknown.__new__(Unknown))
+            self.assertNotIn('Unknown', renderer.render_map)
+
+
+class TestHtmlRendererHeadingIds(TestCase):
+    def test_heading_ids(self):
+        lines = ['# Hello, *World*!\n', '## Hello World\n', 'Hello world\n', '---\n',
+                 '### hello-world-1\n', '# <b>!</b>\n', '# `Code` & Ünïcode\n']
+        expected = ('<h1 id="hello-world">Hello, <em>World</em>!</h1>\n'
+                    '<h2 id="hello-world-1">Hello World</h2>\n'
+                    '<h2 id="hello-world-2">Hello world</h2>\n'
+                    '<h3 id="hello-world-1-1">hello-world-1</h3>\n'
+                    '<h1><b>!</b></h1>\n'
+                    '<h1 id="code--ünïcode"><code>Code</code> &amp; Ünïcode</h1>\n')
+        with HtmlRenderer(heading_ids=True) as renderer:
+            self.assertEqual(renderer.render(Document(lines)), expected)
+            output = io.StringIO()
+            renderer.render_to(Document(lines), output)
+            self.assertEqual(output.getvalue(), expected)
+
+    def test_heading_ids_off(self):
+        with HtmlRenderer() as renderer:
+            self.assertEqual(renderer.render(Document(['# Hello\n'])), '<h1>Hello</h1>\n')
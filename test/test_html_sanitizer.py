@@ -0,0 +1,49 @@
+from unittest import TestCase
+from mistletoe import Document
+from mistletoe.html_renderer import HtmlRenderer
+from mistletoe.html_sanitizer import HtmlSanitizer
+from parameterized import parameterized
+
+
+class TestHtmlSanitizer(TestCase):
+    @parameterized.expand([
+        ('<b>bold</b>', '<b>bold</b>'),
+        ('<SPAN Style="x" TITLE=t>s</SPAN>', '<span title="t">s</span>'),
+        ('<script>alert(1)</script>', 'alert(1)'),
+        ('<img src="x.png" onerror="alert(1)"/>', '<img src="x.png" />'),
+        ('<a href="jav&#x61;script:alert(1)">x</a>', '<a>x</a>'),
+        ('<a href=" java\tscript:alert(1)">x</a>', '<a>x</a>'),
+        ('<a href=\'http://a?b&amp;c\'>x</a>', '<a href="http://a?b&amp;c">x</a>'),
+        ('<!-- comment --><?php x ?><!DOCTYPE html><![CDATA[x]]>', ''),
+        ('a < b <c', 'a &lt; b &lt;c'),
+        ('no markup & no change', 'no markup & no change'),
+    ])
+    def test_sanitize(self, content, expected):
+        self.assertEqual(HtmlSanitizer().sanitize(content), expected)
+
+    @parameterized.expand([
+        ('http://example.com', True),
+        ('MAILTO:a@b.c', True),
+        ('/relative/path:with-colon', True),
+        ('javascript:alert(1)', False),
+        ('\x01 JavaScript:alert(1)', False),
+        ('data:text/html,x', False),
+    ])
+    def test_is_safe_url(self, url, expected):
+        self.assertEqual(HtmlSanitizer().is_safe_url(url), expected)
+
+    def test_custom_allowlists(self):
+        sanitizer = HtmlSanitizer(tags=['iframe'], attributes={'iframe': ['SRC']}, url_schemes=['https'])
+        self.assertEqual(sanitizer.sanitize('<iframe src="https://x" width=1></iframe><b>'), '<iframe src="https://x"></iframe>')
+        self.assertEqual(sanitizer.sanitize('<iframe src="http://x">'), '<iframe>')
+
+
+class TestHtmlRendererSanitizing(TestCase):
+    def test_render(self):
+        lines = ['<div onclick="x()">\n', '<script>alert(1)</script>\n', '</div>\n', '\n',
+                 '<b onmouseover="x()">b</b> [a](javascript:x) ![i](javascript:y) <vbscript:z> [ok](/ok)\n']
+        with HtmlRenderer(sanitizer=HtmlSanitizer()) as renderer:
+            output = renderer.render(Document(lines))
+        expected = ('<div>\nalert(1)\n</div>\n'
+                    '<p><b>b</b> a i vbscript:z <a href="/ok">ok</a></p>\n')
+        self.assertEqual(output, expected)
@@ -77,6 +77,11 @@ class TestLaTeXRenderer(TestCase):
         self._test_token('RawText', expected,
                          children=False, content='$&#{}')
 
+    def test_escape_latex(self):
+        self.assertEqual(LaTeXRenderer.escape_latex('a_b^c 50% {x}'), 'a\\_b\\^{}c 50\\% \\{x\\}')
+        plain = 'nothing to escape'
+        self.assertIs(LaTeXRenderer.escape_latex(plain), plain)
+
     def test_heading(self):
         expected = '\n\\section{inner}\n'
         self._test_token('Heading', expected, level=1)
@@ -170,3 +175,25 @@ class TestLaTeXFootnotes(TestCase):
                   '\n'
                   '\\end{document}\n')
         self.assertEqual(self.renderer.render(Document(raw)), expected)
+
+
+class TestLaTeXRenderTo(TestCase):
+    @parameterized.expand([(1 << 20,), (16,)])
+    def test_render_to(self, spool_size):
+        from io import StringIO
+        from mistletoe import Document
+        with open('test/samples/syntax.md', 'r') as fin:
+            lines = fin.readlines()
+        with LaTeXRenderer() as renderer:
+            renderer.spool_size = spool_size
+            document = Document(lines)
+            output = StringIO()
+            renderer.render_to(document, output)
+            self.assertIn('\\usepackage{hyperref}\n', output.getvalue())
+            self.assertEqual(output.getvalue(), renderer.render(document))
+
+            # multi-byte characters split between chunks, and lone surrogates
+            document = Document(['ü' * 40000 + '\ud800\n'])
+            output = StringIO()
+            renderer.render_to(document, output)
+            self.assertEqual(output.getvalue(), renderer.render(document))
@@ -457,6 +457,23 @@ class TestMarkdownFormatting(unittest.TestCase):
                 "too_\n"
             )
 
+    def test_wordwrap_paragraph_with_glued_words(self):
+        with MarkdownRenderer() as renderer:
+            # given a paragraph with words made of many fragments
+            paragraph = block_token.Paragraph(
+                ["a*b*`c`**d** e*f*\n", "g*h* i\n"]
+            )
+
+            # when reflowing with the max line length set short
+            renderer.max_line_length = 14
+            lines = renderer.render(paragraph)
+
+            # then the fragments of each word stay together
+            assert lines == (
+                "a*b*`c`**d**\n"
+                "e*f* g*h* i\n"
+            )
+
     def test_wordwrap_paragraph_with_inline_code(self):
         with MarkdownRenderer() as renderer:
             # given a paragraph with inline code
@@ -684,3 +701,71 @@ class TestMarkdownFormatting(unittest.TestCase):
 
             # then the table is rendered without any word wrapping
             assert lines == "".join(input)
+
+
+class TestMarkdownVerbatim(unittest.TestCase):
+    source = (
+        "Some   *text*\n"
+        "on two lines.\n"
+        "\n"
+        "| a |  b  |\n"
+        "|---|-----|\n"
+        "| 1 | 2 |\n"
+        "\n"
+        "> quoted\n"
+        "lazily\n"
+    )
+
+    def test_unmodified_document(self):
+        with MarkdownRenderer() as renderer:
+            document = Document(self.source, keep_source=True)
+            self.assertEqual(renderer.render(document), self.source)
+            self.assertFalse(document.modified)
+
+    def test_modified_blocks(self):
+        with MarkdownRenderer() as renderer:
+            document = Document(self.source, keep_source=True)
+            paragraph, _, table, _, quote = document.children
+
+            # replacing children marks the token and its ancestors as modified
+            paragraph.children = [span_token.RawText("Other "), *paragraph.children[1:]]
+            self.assertTrue(paragraph.modified)
+            self.assertTrue(document.modified)
+            self.assertFalse(table.modified)
+
+            # changes of other attributes are to be marked explicitly
+            table.column_align = [1, None]
+            table.mark_modified()
+
+            self.assertEqual(
+                renderer.render(document),
+                "Other *text*\n"
+                "on two lines.\n"
+                "\n"
+                "|   a | b   |\n"
+                "| --: | --- |\n"
+                "|   1 | 2   |\n"
+                "\n"
+                "> quoted\n"
+                "lazily\n",
+            )
+
+    def test_inserted_blocks(self):
+        with MarkdownRenderer() as renderer:
+            document = Document("# Title\n\nSome text.\n", keep_source=True)
+            other = Document("Other *text*\n", keep_source=True)
+            inserted = block_token.tokenize(["Inserted paragraph\n"])
+            document.children = document.children + inserted + other.children
+            self.assertEqual(
+                renderer.render(document),
+                "# Title\n"
+                "\n"
+                "Some text.\n"
+                "Inserted paragraph\n"
+                "Other *text*\n",
+            )
+
+    def test_wordwrap_renders_all_blocks(self):
+        with MarkdownRenderer(max_line_length=80) as renderer:
+            document = Document(self.source, keep_source=True)
+            self.assertEqual(renderer.render(document), renderer.render(Document(self.source)))
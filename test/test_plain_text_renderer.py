@@ -0,0 +1,66 @@
+import io
+from unittest import TestCase
+from mistletoe import Document
+from mistletoe.plain_text_renderer import PlainTextRenderer
+
+
+class TestPlainTextRenderer(TestCase):
+    lines = [
+        '# A *heading*\n',
+        '\n',
+        'Some **strong** `code` & [a link](http://example.com "title")\n',
+        'with ![an image](image.png) and <b>html</b>.\\\n',
+        'Next line <http://auto.link>\n',
+        '\n',
+        '> - item 1\n',
+        '> - item 2\n',
+        '\n',
+        '***\n',
+        '\n',
+        '```python\n',
+        'print("<code>")\n',
+        '```\n',
+        '\n',
+        '<div>\n',
+        'AT&amp;T\n',
+        '</div>\n',
+        '\n',
+        '| a | b |\n',
+        '| - | - |\n',
+        '| c | d |\n',
+    ]
+
+    def _render(self, **kwargs):
+        with PlainTextRenderer(**kwargs) as renderer:
+            return renderer.render(Document(self.lines))
+
+    def test_render(self):
+        expected = ('A heading\n'
+                    'Some strong code & a link\n'
+                    'with an image and html.\n'
+                    'Next line http://auto.link\n'
+                    'item 1\n'
+                    'item 2\n'
+                    'print("<code>")\n'
+                    'AT&T\n'
+                    'a\tb\n'
+                    'c\td\n')
+        self.assertEqual(self._render(), expected)
+
+    def test_options(self):
+        output = self._render(include_code_blocks=False, include_link_targets=True, include_image_alt=False)
+        self.assertIn('a link (http://example.com)\nwith  and html.', output)
+        self.assertNotIn('print', output)
+
+    def test_script_and_style(self):
+        lines = ['<script>\n', 'var x = 1;\n', '</script>\n', '\n',
+                 '<div>\n', 'text<STYLE type="text/css">p { color: red }</style >\n', '</div>\n']
+        with PlainTextRenderer() as renderer:
+            self.assertEqual(renderer.render(Document(lines)), 'text\n')
+
+    def test_render_to(self):
+        with PlainTextRenderer() as renderer:
+            token = Document(self.lines)
+            output = io.StringIO()
+            renderer.render_to(token, output)
+            self.assertEqual(output.getvalue(), renderer.render(token))
@@ -0,0 +1,51 @@
+import gzip
+import io
+import os
+import tempfile
+import zlib
+from unittest import TestCase, mock
+from mistletoe import Document
+from mistletoe.html_renderer import HtmlRenderer
+from mistletoe.sinks import CompressingWriter, TeeWriter, render_to_files
+from parameterized import parameterized
+
+
+class TestSinks(TestCase):
+    def setUp(self):
+        with open('test/samples/syntax.md', 'r', encoding='utf-8') as fin:
+            self.lines = fin.readlines()
+        self.renderer = HtmlRenderer()
+        self.renderer.__enter__()
+        self.addCleanup(self.renderer.__exit__, None, None, None)
+        self.expected = self.renderer.render(Document(self.lines))
+
+    @parameterized.expand([
+        ('gzip', gzip.decompress),
+        ('zlib', zlib.decompress),
+        ('deflate', lambda data: zlib.decompress(data, -zlib.MAX_WBITS)),
+    ])
+    def test_compressing_writer(self, format, decompress):
+        fileobj = io.BytesIO()
+        with CompressingWriter(fileobj, format=format) as writer:
+            self.renderer.render_to(Document(self.lines), writer)
+        self.assertEqual(decompress(fileobj.getvalue()).decode('utf-8'), self.expected)
+
+    def test_compressing_writer_unknown_format(self):
+        self.assertRaises(ValueError, CompressingWriter, io.BytesIO(), format='bzip2')
+
+    def test_render_to_flushes(self):
+        output = TeeWriter(io.StringIO())
+        with mock.patch.object(TeeWriter, 'write', wraps=output.write) as write, \
+                mock.patch.object(HtmlRenderer, 'flush_threshold', 10):
+            self.renderer.render_to(Document(self.lines), output)
+        self.assertGreater(write.call_count, 1)
+        self.assertEqual(output.outputs[0].getvalue(), self.expected)
+
+    def test_render_to_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'syntax.html')
+            render_to_files(self.renderer, Document(self.lines), path, path + '.gz')
+            with open(path, 'r', encoding='utf-8', newline='') as fin:
+                self.assertEqual(fin.read(), self.expected)
+            with gzip.open(path + '.gz', 'rt', encoding='utf-8', newline='') as fin:
+                self.assertEqual(fin.read(), self.expected)